@@ -11,6 +11,7 @@
 # Date: Oct 25, 2015 / July 22, 2022
 
 from ppmodules.readMesh import *
+from ppmodules.writeMesh import *
 from ppmodules.utilities import *
 from progressbar import ProgressBar, Bar, Percentage, ETA
 
@@ -27,9 +28,6 @@ def assign(input_grd="out.grd", boundary_csv="boundary.csv", output_grd="out_fri
                               value
     :return None: creates a grd mesh with assigned (friction) values
     """
-    # create the output file
-    fout = open(output_grd, "w")
-
     # read the adcirc file
     n, e, x, y, z, ikle = readAdcirc(input_grd)
 
@@ -106,17 +104,5 @@ def assign(input_grd="out.grd", boundary_csv="boundary.csv", output_grd="out_fri
     # finish the bar
     pbar.finish()
 
-    # write the adcirc mesh file
-    fout.write("ADCIRC" + "\n")
-    # write the number of elements and number of nodes in the header file
-    fout.write(str(e) + " " + str(n) + "\n")
-
-    # write nodes
-    for i in range(n):
-        fout.write(str(i + 1) + " " + str("{:.3f}".format(x[i])) + " " +
-                   str("{:.3f}".format(y[i])) + " " + str("{:.3f}".format(f[i])) + "\n")
-
-    # write elements
-    for i in range(e):
-        fout.write(str(i + 1) + " 3 " + str(ikle[i, 0] + 1) + " " + str(ikle[i, 1] + 1) + " " +
-                   str(ikle[i, 2] + 1) + "\n")
+    # write the adcirc mesh file, with the attribute as the z value
+    writeAdcirc(n, e, x, y, f, ikle, output_grd)
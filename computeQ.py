@@ -16,6 +16,9 @@
 # defined such that they are perpedicular to the flow. If the sections
 # are not perpedicular to the flow, garbage results may be reported.
 #
+# Revised: Oct 17, 2026
+# The input can also be a compressed archive (*.slfz) written by sel2slfz.py.
+#
 # Uses: Python 2 or 3, Numpy
 #
 # Example:
@@ -55,7 +58,7 @@ lines_file = sys.argv[4]
 output_file = sys.argv[6]
 
 # now read the input *.slf geometry file
-slf = ppSELAFIN(input_file)
+slf = openSELAFIN(input_file)
 slf.readHeader()
 slf.readTimes()
 
@@ -139,19 +142,20 @@ if ((depth_idx < 0) or (velu_idx < 0) or (velv_idx < 0) ):
 Q = np.zeros( (len(times), n_lns) )
 
 # this is the start of the main loop
-for t in range(len(times)):
+# the snapshots are streamed from the *.slf file, with the next ones read
+# in the background while Q is computed for the current one
+# (only depth, velu and velv are read; other variables are skipped)
+frames = slf.iterFrames(variables=[depth_idx, velu_idx, velv_idx])
+
+for t, (time_t, master_results) in enumerate(frames):
   
   # print time step to the user
   print('Computing Q at time step index :' + str(t))
   
-  # read the snapshot for time t from the *.slf file
-  slf.readVariables(t)
-  master_results = slf.getVarValues()
-  
   # store depths, velu and velv from the input file
-  depths = master_results[depth_idx, :]
-  velu = master_results[velu_idx, :]
-  velv = master_results[velv_idx, :]
+  depths = master_results[0, :]
+  velu = master_results[1, :]
+  velv = master_results[2, :]
   
   # to perform the interpolations at the nodes of the resampled lines
   # for depth, velu, and velv
@@ -15,6 +15,9 @@
 # start files for use in TELEMAC simulations. To know which time step
 # to retain, make sure you run probe.py script first.
 #
+# Revised: Oct 17, 2026
+# The time step is copied to the output file as raw bytes.
+#
 # Uses: Python 2 or 3, Numpy
 #
 # Usage:
@@ -64,9 +67,9 @@ NELEM, NPOIN, NDP, IKLE, IPOBO, x, y = slf.getMesh()
 # number of variables
 NVAR = len(vnames)
 
-# read the variables for the specified time step t
-slf.readVariables(t)
-results = slf.getVarValues()
+if (t < 0 or t >= len(times)):
+  print('Time step ' + str(t) + ' is not in ' + input_file + '. Exiting!')
+  sys.exit()
 
 # now write the SELAFIN file for the extracted time step t
 slf_cr = ppSELAFIN(output_file)
@@ -75,12 +78,13 @@ slf_cr.setTitle('created with pputils')
 slf_cr.setVarNames(vnames)
 slf_cr.setVarUnits(vunits)
 slf_cr.setIPARAM([1, 0, 0, 0, 0, 0, 0, 0, 0, 1])
+slf_cr.setNPLAN(slf.getNPLAN())
 slf_cr.setMesh(NELEM, NPOIN, NDP, IKLE, IPOBO, x, y)
 slf_cr.writeHeader()
 
-# write the results
+# write the results (the records of time step t are copied as is)
 # it does not write the time of the original file, but rather
 # writes zero instead; if the user wants the time from the
-# original file, replace zero with times[t]
-slf_cr.writeVariables(0, results)
+# original file, replace [0] with [times[t]]
+slf_cr.copyFrames(slf, [t], [0])
 
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+#
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#                                                                       #
+#                                 diff_sel.py                           # 
+#                                                                       #
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#
+# Author: Pat Prodanovic, Ph.D., P.Eng.
+# 
+# Date: Oct 17, 2026
+#
+# Purpose: Script takes in two *.slf files on the same mesh (for example
+# two scenarios), and writes the difference (a - b) or the ratio (a / b)
+# of the specified variables to a new *.slf file. Only time steps that
+# exist in both files (with the same time) are compared; they are read
+# from both files in lockstep, so each file is read only once. For each
+# time step, the min, max, mean and rms of the difference (or ratio) of
+# each variable are written to a *.csv summary file. Where b is zero, the
+# ratio is set to zero.
+#
+# Uses: Python 2 or 3, Numpy
+#
+# Example:
+#
+# python diff_sel.py -a a.slf -b b.slf -v 0,2 -m diff -o a_minus_b.slf
+# where:
+# -a first *.slf file
+# -b second *.slf file
+# -v indices of the variables (comma separated, no spaces)
+# -m diff for a - b, or ratio for a / b
+# -o output *.slf file (the summary is written to a *.csv file with the
+#    same name)
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Global Imports
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+import os,sys
+import numpy as np
+from ppmodules.selafin_io_pp import *
+# 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# MAIN
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~  
+if len(sys.argv) != 11 :
+  print('Wrong number of Arguments, stopping now...')
+  print('Usage:')
+  print('python diff_sel.py -a a.slf -b b.slf -v 0,2 -m diff -o a_minus_b.slf')
+  sys.exit()
+
+a_file = sys.argv[2]
+b_file = sys.argv[4]
+var_idx = [int(v) for v in sys.argv[6].split(',')]
+mode = sys.argv[8]
+output_file = sys.argv[10]
+summary_file = output_file.rsplit('.',1)[0] + '.csv'
+
+if (mode != 'diff' and mode != 'ratio'):
+  print('Mode must be diff or ratio. Exiting!')
+  sys.exit()
+
+# reads both files
+a = ppSELAFIN(a_file)
+a.readHeader()
+a.readTimes()
+
+b = ppSELAFIN(b_file)
+b.readHeader()
+b.readTimes()
+
+a_times = a.getTimes()
+b_times = b.getTimes()
+vnames = a.getVarNames()
+vunits = a.getVarUnits()
+b_vnames = b.getVarNames()
+float_type,float_size = a.getPrecision()
+NELEM, NPOIN, NDP, IKLE, IPOBO, x, y = a.getMesh()
+
+# the mesh is checked once, for all nodes and elements at once
+if not a.compareMesh(b):
+  print('Meshes of the two files are not the same. Exiting!')
+  sys.exit()
+
+for v in var_idx:
+  if (v < 0 or v >= len(vnames) or v >= len(b_vnames)):
+    print('Variable index ' + str(v) + ' is not in both files. Exiting!')
+    sys.exit()
+  if (vnames[v] != b_vnames[v]):
+    print('Variable ' + str(v) + ' is not the same in both files. Exiting!')
+    sys.exit()
+
+# pair up the time steps having the same time in both files
+a_idx = list()
+b_idx = list()
+for i in range(len(a_times)):
+  match = np.nonzero(np.isclose(b_times, a_times[i], rtol=0.0, atol=1.0E-6))[0]
+  if (len(match) > 0):
+    a_idx.append(i)
+    b_idx.append(match[0])
+
+if (len(a_idx) == 0):
+  print('No time steps are common to both files. Exiting!')
+  sys.exit()
+
+print('Comparing ' + str(len(a_idx)) + ' time steps ...')
+
+# write the front matter of the output *.slf file
+out = ppSELAFIN(output_file)
+out.setPrecision(float_type, float_size)
+out.setTitle('created with pputils')
+out.setVarNames([vnames[v] for v in var_idx])
+if (mode == 'diff'):
+  out.setVarUnits([vunits[v] for v in var_idx])
+else:
+  out.setVarUnits(['-' for v in var_idx])
+out.setIPARAM([1, 0, 0, 0, 0, 0, 0, 0, 0, 1])
+out.setNPLAN(a.getNPLAN())
+out.setDATE(a.getDATE())
+out.setMesh(NELEM, NPOIN, NDP, IKLE, IPOBO, x, y)
+out.writeHeader()
+
+# the summary file
+fsum = open(summary_file, 'w')
+fsum.write('time')
+for v in var_idx:
+  name = vnames[v].strip()
+  fsum.write(', ' + name + ' min, ' + name + ' max, ' + name + ' mean, ' +
+    name + ' rms')
+fsum.write('\n')
+
+# stream the matching time steps of both files in lockstep
+a_frames = a.iterFrames(variables=var_idx, frames=a_idx)
+b_frames = b.iterFrames(variables=var_idx, frames=b_idx)
+
+for (time, a_res), (b_time, b_res) in zip(a_frames, b_frames):
+  if (mode == 'diff'):
+    res = a_res - b_res
+  else:
+    res = np.divide(a_res, b_res, out=np.zeros_like(a_res), where=(b_res != 0))
+
+  out.writeVariables(time, res)
+
+  fsum.write(str(time))
+  for i in range(len(var_idx)):
+    fsum.write(', ' + str(np.min(res[i])) + ', ' + str(np.max(res[i])) + ', ' +
+      str(np.mean(res[i])) + ', ' + str(np.sqrt(np.mean(res[i]**2))))
+  fsum.write('\n')
+
+fsum.close()
+out.close()
+a.close()
+b.close()
+
+print('All done!')
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+#
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#                                                                       #
+#                                 envelope_sel.py                       # 
+#                                                                       #
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#
+# Author: Pat Prodanovic, Ph.D., P.Eng.
+# 
+# Date: Oct 17, 2026
+#
+# Purpose: Script takes in a *.slf file, and computes the temporal envelope
+# of the specified variables at every node: the max, min, mean, time of
+# the max, and the duration for which the variable is above a threshold.
+# The *.slf file is read only once. The frames can optionally be split into
+# ranges processed in parallel, with the results merged at the end. The
+# envelope is written as a *.slf file with a single time step, having five
+# variables (MAX, MIN, MEAN, TMAX, DUR) for each variable specified.
+#
+# The duration above the threshold adds up, for each time step where the
+# variable is above the threshold, the time since the previous time step.
+#
+# Uses: Python 2 or 3, Numpy
+#
+# Example:
+#
+# python envelope_sel.py -i in.slf -v 0,2 -e 0.05 -n 4 -o envelope.slf
+# where:
+# -i input *.slf file
+# -v indices of the variables (comma separated, no spaces)
+# -e threshold used to compute the duration of exceedance
+# -n number of processes to use (1 for no parallel processing)
+# -o output *.slf file with the envelope
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Global Imports
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+import os,sys
+import numpy as np
+from multiprocessing import Pool
+from ppmodules.selafin_io_pp import *
+#
+def envelope_part(args):
+  # computes the envelope for the frame range t_start to t_end; each
+  # process reads the *.slf file through its own ppSELAFIN object
+  input_file, var_idx, threshold, t_start, t_end = args
+  slf = ppSELAFIN(input_file)
+  slf.readHeader()
+  slf.readTimes()
+  part = slf.computeEnvelope(var_idx, threshold, t_start, t_end)
+  slf.close()
+  return part
+# 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# MAIN
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~  
+# the processes started by Pool import this script, so the main part must
+# only run when the script is executed
+if __name__ == '__main__':
+  if len(sys.argv) != 11 :
+    print('Wrong number of Arguments, stopping now...')
+    print('Usage:')
+    print('python envelope_sel.py -i in.slf -v 0,2 -e 0.05 -n 4 -o envelope.slf')
+    sys.exit()
+
+  input_file = sys.argv[2]
+  var_idx = [int(v) for v in sys.argv[4].split(',')]
+  threshold = float(sys.argv[6])
+  nproc = int(sys.argv[8])
+  output_file = sys.argv[10]
+
+  # reads the *.slf file
+  slf = ppSELAFIN(input_file)
+  slf.readHeader()
+  slf.readTimes()
+
+  times = slf.getTimes()
+  vnames = slf.getVarNames()
+  vunits = slf.getVarUnits()
+  float_type,float_size = slf.getPrecision()
+  NELEM, NPOIN, NDP, IKLE, IPOBO, x, y = slf.getMesh()
+
+  for v in var_idx:
+    if (v < 0 or v >= len(vnames)):
+      print('Variable index ' + str(v) + ' is not in ' + input_file + '. Exiting!')
+      sys.exit()
+
+  # split the time steps into nproc consecutive ranges
+  nproc = max(1, min(nproc, len(times)))
+  bounds = np.linspace(0, len(times), nproc + 1).astype(int)
+  ranges = [(input_file, var_idx, threshold, bounds[i], bounds[i+1] - 1)
+    for i in range(nproc)]
+
+  print('Computing the envelope of ' + str(len(times)) + ' time steps ...')
+  if (nproc > 1):
+    pool = Pool(nproc)
+    parts = pool.map(envelope_part, ranges)
+    pool.close()
+    pool.join()
+  else:
+    parts = [slf.computeEnvelope(var_idx, threshold)]
+
+  vmax, vmin, vsum, tmax, dur, count = mergeEnvelopes(parts)
+  vmean = vsum / max(1, count)
+
+  # output variables, for each variable in var_idx
+  out_vnames = list()
+  out_vunits = list()
+  for v in var_idx:
+    name = vnames[v].strip()[0:11]
+    out_vnames.append('MAX ' + name)
+    out_vnames.append('MIN ' + name)
+    out_vnames.append('MEAN ' + name)
+    out_vnames.append('TMAX ' + name)
+    out_vnames.append('DUR ' + name)
+    out_vunits.extend([vunits[v], vunits[v], vunits[v], 'S', 'S'])
+
+  results = np.zeros((5 * len(var_idx), NPOIN))
+  for i in range(len(var_idx)):
+    results[5*i + 0, :] = vmax[i]
+    results[5*i + 1, :] = vmin[i]
+    results[5*i + 2, :] = vmean[i]
+    results[5*i + 3, :] = tmax[i]
+    results[5*i + 4, :] = dur[i]
+
+  # write the envelope *.slf file
+  out = ppSELAFIN(output_file)
+  out.setPrecision(float_type, float_size)
+  out.setTitle('created with pputils')
+  out.setVarNames(out_vnames)
+  out.setVarUnits(out_vunits)
+  out.setIPARAM([1, 0, 0, 0, 0, 0, 0, 0, 0, 1])
+  out.setNPLAN(slf.getNPLAN())
+  out.setDATE(slf.getDATE())
+  out.setMesh(NELEM, NPOIN, NDP, IKLE, IPOBO, x, y)
+  out.writeHeader()
+  out.writeVariables(0.0, results)
+  out.close()
+
+  print('All done!')
@@ -0,0 +1,48 @@
+# reads meshes in which the lines of a block have different numbers of
+# fields (extra columns on some lines only); each line has to keep its own
+# values, rather than the block being reshaped as if all lines were alike
+#
+# run with pytest, or as a script: python test_mixed_fields.py
+import os,sys
+import numpy as np
+
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(here, '..', '..'))
+from ppmodules.readMesh import *
+from ppmodules.readMesh import _mesh_cache
+
+x = np.array([0.0, 1.0, 0.0, 1.0])
+y = np.array([0.0, 0.0, 1.0, 1.0])
+z = np.array([5.0, 6.0, 7.0, 8.0])
+ikle = np.array([[0, 1, 2], [1, 3, 2]])
+
+
+def run():
+	# parse the ascii files, not a cached copy
+	cache = dict(_mesh_cache)
+	setMeshCache(enabled=False)
+	results = []
+	try:
+		for reader, mesh_file in [(readAdcirc, 'mixed_fields.grd'), (read2dm, 'mixed_fields.2dm'),
+			(readDat, 'mixed_fields.dat')]:
+			n, e, mx, my, mz, mikle = reader(os.path.join(here, mesh_file))
+			same = (n == 4 and e == 2 and np.array_equal(mx, x) and np.array_equal(my, y) and
+				np.array_equal(mz, z) and np.array_equal(mikle, ikle))
+			results.append((mesh_file, same))
+	finally:
+		setMeshCache(cache["enabled"], cache["dir"])
+	return results
+
+
+def test_mixed_fields():
+	for mesh_file, same in run():
+		assert same, mesh_file
+
+
+if __name__ == '__main__':
+	ok = True
+	for mesh_file, same in run():
+		print(mesh_file + ': ' + ('ok' if same else 'WRONG'))
+		ok = ok and same
+	if not ok:
+		sys.exit(1)
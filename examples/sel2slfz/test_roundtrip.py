@@ -0,0 +1,122 @@
+# checks that a lossless compressed archive (tolerance of 0) restores the
+# original *.slf file byte for byte, header and record markers included;
+# for a set of *.slf files (restart segments) the restored file has the
+# header of the first segment, followed by the frames kept from each one;
+# also checks which reader openSELAFIN() returns for names with commas
+#
+# run with pytest, or as a script: python test_roundtrip.py
+import os,sys
+import tempfile
+
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(here, '..', '..'))
+from ppmodules.selafin_io_pp import *
+
+slf_file = os.path.join(here, '..', 'sel2asc', 'f2d_malpasset-small.slf')
+
+
+def make_set(folder):
+	# writes a second segment that restarts at the last time of the example
+	# file, and is longer than it (so its frames are past the end of the
+	# first file), with values that differ from those of the first file
+	src = ppSELAFIN(slf_file)
+	src.readHeader()
+	src.readTimes()
+	src.readVariables(len(src.getTimes()) - 1)
+	last = src.getVarValues()
+	t_last = src.getTimes()[-1]
+
+	seg_file = os.path.join(folder, 'segment2.slf')
+	seg = ppSELAFIN(seg_file)
+	seg.setPrecision(*src.getPrecision())
+	seg.setTitle(src.title)
+	seg.setVarNames(src.getVarNames())
+	seg.setVarUnits(src.getVarUnits())
+	seg.setIPARAM(src.IPARAM)
+	seg.setDATE(src.getDATE())
+	seg.setMesh(*src.getMesh())
+	seg.writeHeader()
+	for k in range(4):
+		seg.writeVariables(t_last + k * 1000.0, last + 10.0 * (k + 1))
+	seg.close()
+	src.close()
+
+	return slf_file + ',' + seg_file
+
+
+def expected_bytes(input_file):
+	# the header of the (first) file, and the records of the frames read
+	slf = openSELAFIN(input_file)
+	slf.readHeader()
+	slf.readTimes()
+	frame_size = (4 + slf.float_size + 4 +
+		slf.NBV1 * (4 + slf.float_size * slf.NPOIN + 4))
+	data = [slf.getHeaderBytes()]
+	for t in range(len(slf.getTimes())):
+		f = slf.getFrameFile(t)
+		f.seek(slf.getFrameOffsets()[t])
+		data.append(f.read(frame_size))
+	slf.close()
+	return b''.join(data)
+
+
+def roundtrip(input_file, folder, codec):
+	z_file = os.path.join(folder, 'archive.slfz')
+	out_file = os.path.join(folder, 'restored.slf')
+
+	slf = openSELAFIN(input_file)
+	slf.readHeader()
+	slf.readTimes()
+	slf.writeArchive(z_file, codec, 0.0)
+	slf.close()
+
+	z = openSELAFIN(z_file)
+	z.readHeader()
+	z.writeSELAFIN(out_file)
+	z.close()
+
+	with open(out_file, 'rb') as f:
+		return f.read() == expected_bytes(input_file)
+
+
+def open_kinds(folder, set_file):
+	# openSELAFIN() splits a comma separated string only when it is not a
+	# file itself, so a file name with a comma opens as a single file
+	import shutil
+	comma_file = os.path.join(folder, 'f2d_malpasset,small.slf')
+	shutil.copyfile(slf_file, comma_file)
+	cases = [('comma in file name', comma_file, ppSELAFIN),
+		('comma separated set', set_file, ppSELAFINset),
+		('list of files', set_file.split(','), ppSELAFINset),
+		('list of one file', [comma_file], ppSELAFIN)]
+	results = []
+	for name, input_file, kind in cases:
+		slf = openSELAFIN(input_file)
+		slf.readHeader()
+		results.append((name, type(slf) is kind))
+		slf.close()
+	return results
+
+
+def run(folder):
+	set_file = make_set(folder)
+	results = open_kinds(folder, set_file)
+	for name, input_file in [('slf', slf_file), ('set', set_file)]:
+		for codec in ['zlib', 'lzma', 'none']:
+			results.append((name + ', ' + codec, roundtrip(input_file, folder, codec)))
+	return results
+
+
+def test_roundtrip(tmp_path):
+	for name, same in run(str(tmp_path)):
+		assert same, name
+
+
+if __name__ == '__main__':
+	folder = tempfile.mkdtemp()
+	ok = True
+	for name, same in run(folder):
+		print(name + ': ' + ('ok' if same else 'FAILED'))
+		ok = ok and same
+	if not ok:
+		sys.exit(1)
@@ -0,0 +1,97 @@
+# checks that the node major companion file (*.slfts) written by
+# writeNodeMajor() holds the same time series as readVariablesAtNodes(),
+# for a single *.slf file, a compressed archive, and a set of *.slf files
+# (restart segments), with whole frames in memory and in blocks of nodes
+#
+# run with pytest, or as a script: python test_sel2ts.py
+import os,sys
+import tempfile
+import numpy as np
+
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(here, '..', '..'))
+from ppmodules.selafin_io_pp import *
+
+slf_file = os.path.join(here, '..', 'sel2asc', 'f2d_malpasset-small.slf')
+
+
+def make_set(folder):
+	# writes a second segment that restarts at the last time of the example
+	# file, and is longer than it (so its frames are past the end of the
+	# first file), with values that differ from those of the first file
+	src = ppSELAFIN(slf_file)
+	src.readHeader()
+	src.readTimes()
+	src.readVariables(len(src.getTimes()) - 1)
+	last = src.getVarValues()
+	t_last = src.getTimes()[-1]
+
+	seg_file = os.path.join(folder, 'segment2.slf')
+	seg = ppSELAFIN(seg_file)
+	seg.setPrecision(*src.getPrecision())
+	seg.setTitle(src.title)
+	seg.setVarNames(src.getVarNames())
+	seg.setVarUnits(src.getVarUnits())
+	seg.setIPARAM(src.IPARAM)
+	seg.setDATE(src.getDATE())
+	seg.setMesh(*src.getMesh())
+	seg.writeHeader()
+	for k in range(4):
+		seg.writeVariables(t_last + k * 1000.0, last + 10.0 * (k + 1))
+	seg.close()
+	src.close()
+
+	return slf_file + ',' + seg_file
+
+
+def check(input_file, folder, **kw):
+	slf = openSELAFIN(input_file)
+	slf.readHeader()
+	slf.readTimes()
+
+	ts_file = os.path.join(folder, 'out.slfts')
+	slf.writeNodeMajor(ts_file, **kw)
+
+	nodes = np.array([slf.getNPOIN() - 1, 0, 7, 7, 100, 101, 102, 500])
+	slf.readVariablesAtNodes(nodes)
+	expected = slf.getVarValuesAtNodes()
+
+	ts = ppSELAFINts(ts_file)
+	ts.readHeader()
+	ts.readVariablesAtNodes(nodes)
+	same = (ts.getTimes() == list(slf.getTimes()) and
+		np.array_equal(ts.getVarValuesAtNodes(), expected))
+	ts.close()
+	slf.close()
+	return same
+
+
+def run(folder):
+	set_file = make_set(folder)
+	z_file = os.path.join(folder, 'archive.slfz')
+	slf = ppSELAFIN(slf_file)
+	slf.readHeader()
+	slf.readTimes()
+	slf.writeArchive(z_file)
+	slf.close()
+
+	results = []
+	for name, input_file in [('slf', slf_file), ('slfz', z_file), ('set', set_file)]:
+		results.append((name + ', whole frames', check(input_file, folder)))
+		results.append((name + ', node blocks', check(input_file, folder, mem_limit=4096, min_chunk=2)))
+	return results
+
+
+def test_sel2ts(tmp_path):
+	for name, same in run(str(tmp_path)):
+		assert same, name
+
+
+if __name__ == '__main__':
+	folder = tempfile.mkdtemp()
+	ok = True
+	for name, same in run(folder):
+		print(name + ': ' + ('ok' if same else 'DIFFERENT'))
+		ok = ok and same
+	if not ok:
+		sys.exit(1)
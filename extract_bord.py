@@ -18,13 +18,23 @@
 # that it can be used to force a local TELEMAC-2D model using my bord.f
 # subroutine.
 #
+# Revised: Oct 17, 2026
+# Results at all points are extracted in a single pass through the *.slf
+# file using readVariablesAtNodes(). The input can also be a node major
+# *.slfts file written by sel2ts.py, or a comma separated list of *.slf
+# files on the same mesh (restart segments of one run).
+#
+# Revised: Oct 17, 2026
+# The input can also be a compressed archive (*.slfz) written by sel2slfz.py.
+#
 # Uses: Python 2 or 3, Matplotlib, Numpy, Scipy
 #
 # Example:
 #
 # python extract_pt.py -i in.slf -p points.csv -o out.txt
 # where:
-# -i input *.slf file
+# -i input *.slf file (or *.slfts file, *.slfz archive, or a comma separated
+#    list of *.slf files)
 # -p PPUTILS nodes file with coordinates of extraction points
 # -o output text file
 #
@@ -52,10 +62,15 @@ input_file = sys.argv[2]
 points_file = sys.argv[4]
 output_file = sys.argv[6]
 
-# read the input *.slf file
-slf = ppSELAFIN(input_file)
-slf.readHeader()
-slf.readTimes()
+# read the input *.slf file, or its node major companion file (written
+# by sel2ts.py) which is much faster at extracting time series
+if input_file.endswith('.slfts'):
+  slf = ppSELAFINts(input_file)
+  slf.readHeader()
+else:
+  slf = openSELAFIN(input_file)
+  slf.readHeader()
+  slf.readTimes()
 
 # get times of the selafin file, and the variable names
 times = slf.getTimes()
@@ -73,8 +88,9 @@ for i in range(NVAR):
   variables[i] = ' '.join(variables[i].split())
   units[i] = ' '.join(units[i].split())
 
-# gets some of the mesh properties from the *.slf file
-NELEM, NPOIN, NDP, IKLE, IPOBO, x, y = slf.getMesh()
+# gets the mesh coordinates from the *.slf file
+x = slf.getMeshX()
+y = slf.getMeshY()
 
 # determine if the *.slf file is 2d or 3d by reading how many planes it has
 NPLAN = slf.getNPLAN()
@@ -98,22 +114,16 @@ npoints = len(ox)
 source = np.column_stack((x,y))
 tree = spatial.cKDTree(source)
 
-# list of output for final results for bord.f
-all_res = np.empty([npoints,ntimes,NVAR])
-
 # for each coordinate in the points data, find the corresponding node
-# in the results file mesh
-for i in range(npoints):
-    
-  # find the node index using cKDTree        
-  d, idx = tree.query((ox[i],oy[i]), k = 1)
+# in the results file mesh using cKDTree
+d, idx = tree.query(np.column_stack((ox,oy)), k = 1)
 
-  # now that we know which node it is, use methods in ppSELAFIN_io class
-  slf.readVariablesAtNode(idx)
-  result = slf.getVarValuesAtNode()
+# now that we know which nodes they are, extract the results at all of
+# them in one pass through the *.slf file; the output for bord.f is a
+# [npoints,ntimes,NVAR] array
+slf.readVariablesAtNodes(idx)
+all_res = slf.getVarValuesAtNodes()
 
-  all_res[i,:,:] = result
-  
 # to write a separate file for each variable
 for k in range(NVAR):
   out = np.transpose(all_res[:,:,k])
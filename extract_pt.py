@@ -39,13 +39,25 @@
 # for 3d files had to be adjusted, so that output remained the same as
 # before.
 #
+# Revised: Oct 17, 2026
+# Results for all planes are extracted in a single pass through the *.slf
+# file using readVariablesAtNodes().
+#
+# Revised: Oct 17, 2026
+# The input can be a comma separated list of *.slf files on the same mesh
+# (restart segments of one run), which are read as one continuous file.
+#
+# Revised: Oct 17, 2026
+# The input can also be a compressed archive (*.slfz) written by sel2slfz.py.
+#
 # Uses: Python 2 or 3, Matplotlib, Numpy
 #
 # Example:
 #
 # python extract_pt.py -i in.slf -x 100.0 -y 200.0 -o out.txt
 # where:
-# -i input *.slf file
+# -i input *.slf file (or *.slfz archive, or a comma separated list of
+#    restart segments)
 # -x, y coordinates of the node for which to extract data
 # -o output text file
 #
@@ -78,8 +90,8 @@ output_file = sys.argv[8]
 # the output file
 fout = open(output_file, 'w')
 
-# reads the *.slf file
-slf = ppSELAFIN(input_file)
+# reads the *.slf file (a list of restart segments is read as one file)
+slf = openSELAFIN(input_file)
 slf.readHeader()
 slf.readTimes()
 
@@ -129,8 +141,8 @@ NPLAN = slf.getNPLAN()
 #fout.write('The file has ' + str(NPLAN) + ' planes' + '\n')
 
 # store just the x and y coords
-x2d = x[0:int(len(x)/NPLAN)]
-y2d = y[0:int(len(x)/NPLAN)]
+x2d = x[0:slf.getNPOIN2()]
+y2d = y[0:slf.getNPOIN2()]
 
 # create a KDTree object
 source = np.column_stack((x2d,y2d))
@@ -143,15 +155,8 @@ d, idx = tree.query((xu,yu), k = 1)
 #fout.write('Extraction performed at: ' + str(x[idx]) + ' ' + str(y[idx]) + '\n')
 #fout.write('Note this is the closest node to the input coordinate!' + '\n')
 
-# now we need this index for all planes
-idx_all = np.zeros(NPLAN,dtype=np.int32)
-
-# the first plane
-idx_all[0] = idx
-
-# start at second plane and go to the end
-for i in range(1,NPLAN,1):
-  idx_all[i] = idx_all[i-1] + (NPOIN / NPLAN)
+# now we need this index for all planes (each plane has NPOIN2 nodes)
+idx_all = idx + np.arange(NPLAN) * slf.getNPOIN2()
 
 # now we are ready to output the results
 # to write the header of the output file
@@ -167,9 +172,11 @@ fout.write('\n')
 
 ########################################################################
 # extract results for every plane (if there are multiple planes that is)
+slf.readVariablesAtNodes(idx_all)
+results_all = slf.getVarValuesAtNodes()
+
 for p in range(NPLAN):
-  slf.readVariablesAtNode(idx_all[p])
-  results = slf.getVarValuesAtNode()
+  results = results_all[p]
   
   # outputs the results 'd %b %Y %H:%M'
   for i in range(len(times)):
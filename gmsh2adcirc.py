@@ -12,6 +12,7 @@
 
 import os
 import numpy as np
+from ppmodules.writeMesh import *
 
 
 # verification function for counter-clockwise (CCW) orientation
@@ -26,8 +27,6 @@ def gmsh2adcirc(gmsh_msh="out.msh", adcirc_grd="out.grd"):
     :param str adcirc_grd: full path and *.grd adcirc geometry mesh file
     :return None: writes adcirc grid file (boundary nodes are not written)
     """
-    # create output file
-    fout = open(adcirc_grd, "w")
     target_dir = os.path.dirname(os.path.abspath(adcirc_grd)) + "/"
     if not os.path.isdir(target_dir):
         print("WARNING: the target directory (%s) is not a does not exist -> I attempt to create it ...")
@@ -101,11 +100,6 @@ def gmsh2adcirc(gmsh_msh="out.msh", adcirc_grd="out.grd"):
     e3 = elements_data[7, :]
     e3 = e3.astype(np.int32)
 
-    # write the adcirc mesh file
-    fout.write("ADCIRC" + "\n")
-    # write the number of elements and number of nodes in the header file
-    fout.write(str(len(e1)) + " " + str(len(node_id)) + "\n")
-
     # make sure the elements are oriented CCW (counter clock wise)
     ikle = np.column_stack((e1, e2, e3))
     # iteratre on elements and make sure they are CCW-oriented
@@ -120,15 +114,9 @@ def gmsh2adcirc(gmsh_msh="out.msh", adcirc_grd="out.grd"):
             ikle[i, 0] = t2
             ikle[i, 2] = t0
 
-    # write nodes
-    for i in range(0, len(node_id)):
-        fout.write(str(node_id[i]) + " " + str("{:.3f}".format(x[i])) + " " +
-                   str("{:.3f}".format(y[i])) + " " + str("{:.3f}".format(z[i])) + "\n")
-
-    # write elements
-    for i in range(0, len(e1)):
-        fout.write(str(i + 1) + " 3 " + str(ikle[i, 0]) + " " + str(ikle[i, 1]) + " " +
-                   str(ikle[i, 2]) + "\n")
+    # write the adcirc mesh file (the nodes of the *.msh file are numbered from one, writeAdcirc() expects the ikle
+    # to start at zero)
+    writeAdcirc(len(node_id), len(e1), x, y, z, ikle - 1, adcirc_grd)
 
     # delete the temp file
     os.remove(temp_nodes_file)
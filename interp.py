@@ -12,6 +12,7 @@
 
 import matplotlib.tri as mtri
 from ppmodules.readMesh import *
+from ppmodules.writeMesh import *
 
 
 def inter(tin_file="surface.tin", mesh_msh="mesh.grd", output_grd="mesh_interp.grd", interpolate_nans=True):
@@ -55,20 +56,5 @@ def inter(tin_file="surface.tin", mesh_msh="mesh.grd", output_grd="mesh_interp.g
                     minidx = np.argmin(dist)
                     m_z[i] = t_z[minidx]
 
-    # create the output file
-    fout = open(output_grd, "w")
-
     # write the adcirc mesh file
-    fout.write("ADCIRC" + "\n")
-    # write the number of elements and number of nodes in the header file
-    fout.write(str(m_e) + " " + str(m_n) + "\n")
-
-    # write nodes
-    for i in range(0, m_n):
-        fout.write(str(i + 1) + " " + str("{:.3f}".format(m_x[i])) + " " +
-                   str("{:.3f}".format(m_y[i])) + " " + str("{:.3f}".format(m_z[i])) + "\n")
-
-    # write elements
-    for i in range(0, m_e):
-        fout.write(str(i + 1) + " 3 " + str(m_ikle[i, 0] + 1) + " " + str(m_ikle[i, 1] + 1) + " " +
-                   str(m_ikle[i, 2] + 1) + "\n")
+    writeAdcirc(m_n, m_e, m_x, m_y, m_z, m_ikle, output_grd)
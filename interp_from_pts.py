@@ -12,6 +12,7 @@
 
 from scipy import spatial  # scipy to get kdTree
 from ppmodules.readMesh import *
+from ppmodules.writeMesh import *
 from progressbar import ProgressBar, Bar, Percentage, ETA
 
 
@@ -87,20 +88,5 @@ def interp_from_pts(points_csv="points.csv", mesh_grd="mesh.grd", interp_mesh_gr
     pbar.finish()
 
     print("writing results to file...")
-    # create the output file (i.e., the interpolated mesh)
-    fout = open(interp_mesh_grd, "w")
-
-    # write the adcirc mesh file
-    fout.write("ADCIRC" + "\n")
-    # write the number of elements and number of nodes in the header file
-    fout.write(str(m_e) + " " + str(m_n) + "\n")
-
-    # write nodes
-    for i in range(0, m_n):
-        fout.write(str(i + 1) + " " + str("{:.3f}".format(m_x[i])) + " " +
-                   str("{:.3f}".format(m_y[i])) + " " + str("{:.3f}".format(m_z[i])) + "\n")
-
-    # write elements
-    for i in range(0, m_e):
-        fout.write(str(i + 1) + " 3 " + str(m_ikle[i, 0] + 1) + " " + str(m_ikle[i, 1] + 1) + " " +
-                   str(m_ikle[i, 2] + 1) + "\n")
+    # write the output file (i.e., the interpolated mesh)
+    writeAdcirc(m_n, m_e, m_x, m_y, m_z, m_ikle, interp_mesh_grd)
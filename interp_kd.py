@@ -44,6 +44,9 @@
 # if (abs(A) < 1.0E-6):
 # The break statement was removed.
 #
+# Revised: Oct 17, 2026
+# The interpolated mesh is now written by writeAdcirc().
+#
 # Uses: Python 2 or 3, Numpy, Scipy
 #
 # Example:
@@ -63,6 +66,7 @@ import numpy             as np             # numpy
 from scipy import spatial                  # kd tree for searching coords
 from scipy import linalg                   # linear algebra package
 from ppmodules.readMesh import *           # to get all readMesh functions
+from ppmodules.writeMesh import *          # to get all writeMesh functions
 from ppmodules.utilities import * 
 from progressbar import ProgressBar, Bar, Percentage, ETA
 #
@@ -86,9 +90,6 @@ if (neigh < 2):
 	print('Number of neighbours must be greater than 1 ... Exiting')
 	sys.exit()
 
-# to create the output file
-fout = open(output_file,'w')
-
 # read the adcirc tin file
 print('Reading TIN ...')
 t_n,t_e,t_x,t_y,t_z,t_ikle = readAdcirc(tin_file)
@@ -199,23 +200,7 @@ pbar.finish()
 
 # now write the adcirc mesh file
 print('Writing results to file ...')
-# to create the output file (this is the interpolated mesh)
-fout = open(output_file,'w')
-
-# now to write the adcirc mesh file
-fout.write('ADCIRC' + '\n')
-# writes the number of elements and number of nodes in the header file
-fout.write(str(m_e) + ' ' + str(m_n) + '\n')
-
-# writes the nodes
-for i in range(0,m_n):
-	fout.write(str(i+1) + ' ' + str('{:.3f}'.format(m_x[i])) + ' ' + 
-		str('{:.3f}'.format(m_y[i])) + ' ' + str('{:.3f}'.format(m_z[i])) + '\n')
-#
-# writes the elements
-for i in range(0,m_e):
-	fout.write(str(i+1) + ' 3 ' + str(m_ikle[i,0]+1) + ' ' + str(m_ikle[i,1]+1) + ' ' + 
-		str(m_ikle[i,2]+1) + '\n')
+writeAdcirc(m_n, m_e, m_x, m_y, m_z, m_ikle, output_file)
 
 print('All done')	
 	
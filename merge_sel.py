@@ -14,6 +14,10 @@
 # names (and the same order of variable names), and merges them
 # to a single file. 
 #
+# Revised: Oct 17, 2026
+# Frames are copied to the merged file as raw bytes, rather than decoded
+# and re-encoded value by value.
+#
 # Uses: Python 2 or 3, Matplotlib, Numpy
 #
 # Example:
@@ -110,16 +114,9 @@ if (a_NVAR != b_NVAR):
   print('Number of variables are not the same. Exiting!')
   sys.exit()
 
-# compare the x coordinates
-sum_diff_x = sum(a_x - b_x)
-if (sum_diff_x > 1.0E-6):
-  print('Mismatch in x coordinates are not the same. Exiting!')
-  sys.exit()	
-
-# compare the y coordinates
-sum_diff_y = sum(a_y - b_y)
-if (sum_diff_y > 1.0E-6):
-  print('Mismatch in y coordinates are not the same. Exiting!')
+# compare the connectivity and the x and y coordinates
+if not a.compareMesh(b):
+  print('Meshes of the two files are not the same. Exiting!')
   sys.exit()
 
 # stores the matches from list a and list b
@@ -145,22 +142,14 @@ merged.setTitle('created with pputils')
 merged.setVarNames(a_variables)
 merged.setVarUnits(a_units)
 merged.setIPARAM([1, 0, 0, 0, 0, 0, 0, 0, 0, 1])
+merged.setNPLAN(a.getNPLAN())
 merged.setMesh(a_NELEM, a_NPOIN, a_NDP, a_IKLE, a_IPOBO, a_x, a_y)
 merged.writeHeader()
 
-# read the results from a, and write it to the merged
-for t in range(len(a_times)):
-  a.readVariables(t)
-  res = a.getVarValues()
-  
-  merged.writeVariables(a_times[t], res)
-  
-# read the results from b, and write it to the merged  
-for t in range(len(b_times)):
-  b.readVariables(t)
-  res = b.getVarValues()
-  
-  merged.writeVariables(b_times[t], res)
+# copy the results from a, and then from b, to the merged file; the frames
+# are copied as raw bytes (as the precision and layout of a and b match)
+merged.copyFrames(a)
+merged.copyFrames(b)
 
 a.close()
 b.close()
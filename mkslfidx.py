@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+#
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#                                                                       #
+#                                 mkslfidx.py                           # 
+#                                                                       #
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#
+# Author: Pat Prodanovic, Ph.D., P.Eng.
+#
+# Date: Oct 17, 2026
+#
+# Purpose: Creates (or refreshes) the sidecar index of a selafin file. The
+# index is written next to the *.slf file (input.slf -> input.slfidx), and
+# holds the header summary, the times and byte offsets of the frames, and
+# the min, max and mean of each variable for each time step. It is only
+# used while the size and modification time of the *.slf file match those
+# stored in the index. Scripts such as probe.py and scan.py use the index
+# when it exists, so that repeated inspection of a large file is instant.
+#
+# Uses: Python 2 or 3, Numpy
+#
+# Example: python mkslfidx.py -i input.slf
+# 
+# where:
+#       --> -i is the telemac *.slf file being indexed
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Global Imports
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# need future for backward compatibility with python2
+from __future__ import absolute_import, division, print_function
+import sys
+import numpy as np             
+from ppmodules.selafin_io_pp import *
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# MAIN
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+#
+if len(sys.argv) != 3:
+  print('Wrong number of Arguments, stopping now...')
+  print('Example usage:')
+  print('python mkslfidx.py -i input.slf')
+  sys.exit()
+
+input_file = sys.argv[2]   # input *.slf file
+
+# constructor for pp_SELAFIN class
+slf = ppSELAFIN(input_file)
+slf.readHeader()
+
+if slf.readIndex():
+  print('Index ' + slf.getIndexFile() + ' is up to date.')
+else:
+  print('Indexing ' + input_file + ' ...')
+  slf.readTimes()
+  slf.writeIndex()
+  print('Index written to ' + slf.getIndexFile())
+
+slf.close()
+
+print('All done!')
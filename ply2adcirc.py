@@ -21,6 +21,9 @@
 # 
 # Works for Python 2 or Python 3
 #
+# Modified: Oct 17, 2026
+# Writes the adcirc file with writeAdcirc() from ppmodules.
+#
 # Uses: Python 2 or 3, Numpy
 #
 # Example:
@@ -37,6 +40,7 @@
 import os,sys
 import numpy as np
 from ppmodules.readMesh import *           # to get all readMesh functions
+from ppmodules.writeMesh import *          # to get all writeMesh functions
 #
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 # MAIN
@@ -52,9 +56,6 @@ if len(sys.argv) != 5 :
 ply_file = sys.argv[2]	
 adcirc_file = sys.argv[4]
 
-# to create the output files
-fout = open(adcirc_file,'w')
-
 # read the ply file
 n,e,x,y,z,ikle = readPly(ply_file)
 
@@ -80,20 +81,8 @@ xref = float(coords[0].split()[0])
 yref = float(coords[0].split()[1])
 
 # now to write the adcirc mesh file with the corrext coordinates
-fout.write("ADCIRC" + "\n")
-
-# writes the number of elements and number of nodes in the header file
-fout.write(str(e) + " " + str(n) + "\n")
-
-# writes the nodes
-for i in range(n):
-	fout.write(str(i+1) + " " + str("{:.3f}".format(x[i]+xref)) + " " + 
-		str("{:.3f}".format(y[i]+yref)) + " " + str("{:.3f}".format(z[i])) + "\n")
-
-# writes the elements
-for i in range(e):
-	fout.write(str(i+1) + " 3 " + str(ikle[i,0]) + " " + str(ikle[i,1]) + " " + 
-		str(ikle[i,2]) + "\n")	
+# (the ikle from readPly() starts at one, writeAdcirc() expects it to start at zero)
+writeAdcirc(n, e, x + xref, y + yref, z, ikle - 1, adcirc_file)
 
 print("All Done!")
 
@@ -3,303 +3,430 @@ pputils functions for reading meshes, re-formatted and optimized for Python3
 Original Author: Pad Prodanovic
 Modularized by: Sebastian Schwindt
 """
+import functools
+import hashlib
+import os
+import struct
+import warnings
+import zipfile
 import numpy as np
 
+# the meshes read by the readers below are cached in a binary (*.npz) file,
+# so that the ascii mesh is only parsed once; by default the cache files are
+# kept in the user's cache directory (~/.cache/pputils/meshes), outside of
+# the source tree; the PPUTILS_MESH_CACHE environment variable (or
+# setMeshCache) gives another directory, keeps each cache file next to its
+# mesh when set to "mesh" (mesh.grd --> mesh.grd.npz), or turns the cache
+# off when set to "off"
+_default_cache_dir = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+                                  "pputils", "meshes")
+_mesh_cache = {"enabled": True, "dir": _default_cache_dir}
+if os.environ.get("PPUTILS_MESH_CACHE", "").lower() in ("off", "0", "no", "false"):
+    _mesh_cache["enabled"] = False
+elif os.environ.get("PPUTILS_MESH_CACHE", "").lower() == "mesh":
+    _mesh_cache["dir"] = None
+elif os.environ.get("PPUTILS_MESH_CACHE"):
+    _mesh_cache["dir"] = os.environ["PPUTILS_MESH_CACHE"]
+
+# version of the cache files; caches of another version are rebuilt
+_mesh_cache_version = "2"
+
+
+def _line_starts(data):
+    """
+    Finds the offset of the start of each line of a file read as bytes
+    :param bytes data: contents of the file
+    :return: array with the offset of each line start, followed by the end of data
+    """
+    newlines = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == ord("\n"))
+    starts = np.concatenate(([0], newlines + 1))
+    if not data.endswith(b"\n"):
+        starts = np.append(starts, len(data))
+    return starts
 
-def readAdcirc(adcirc_file):
+
+def _field_counts(block, starts):
     """
-    Reads an adcirc (grd) file
-    :param str adcirc_file: file name to read
-    :return:
+    Counts the (white space separated) fields on each line of a block of lines
+    :param bytes block: the lines of the block
+    :param starts: offset of the start of each line in block
+    :return: array with the number of fields on each line
     """
+    if len(block) == 0:
+        return np.zeros(len(starts), dtype=np.int64)
 
-    fin = open(adcirc_file)
+    is_space = np.zeros(256, dtype=bool)
+    is_space[np.frombuffer(b" \t\r\n", dtype=np.uint8)] = True
+    space = is_space[np.frombuffer(block, dtype=np.uint8)]
 
-    # first line is the title string
-    title_name = fin.readline()
+    # a field starts at each character that is not a space, but follows one
+    field_start = np.empty(space.size, dtype=bool)
+    field_start[0:1] = True
+    field_start[1:] = space[:-1]
+    field_start &= ~space
+    return np.add.reduceat(field_start, starts, dtype=np.int64)
 
-    # second line is e, n
-    title_name = fin.readline()
-    e = int(title_name.split()[0])
-    n = int(title_name.split()[1])
 
-    # declare the arrays that are needed to store the values read
-    x = np.zeros(n, dtype=np.float64)
-    y = np.zeros(n, dtype=np.float64)
-    z = np.zeros(n, dtype=np.float64)
+def _parse_block(block, nlines, ncols, dtype):
+    """
+    Parses a block of nlines lines of ncols numbers each with a single call
+    to numpy's parser, when every line has the same number of fields; lines
+    with extra (or missing) fields are parsed one at a time instead, keeping
+    the first ncols fields of each line
+    :param bytes block: the lines of the block
+    :param int nlines: number of lines in the block
+    :param int ncols: number of values to keep from each line
+    :param dtype: numpy dtype of the values
+    :return: array of shape (nlines, ncols)
+    """
+    if nlines == 0:
+        return np.zeros((0, ncols), dtype=dtype)
 
-    ikle = np.zeros((e, 3), dtype=np.int64)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            values = np.fromstring(block.decode(), dtype=dtype, sep=" ")
+    except ValueError:
+        values = np.zeros(0, dtype=dtype)
 
-    # read nodes
-    for i in range(n):
-        f_string = fin.readline()
-        lst = f_string.split()
-        x[i] = lst[1]
-        y[i] = lst[2]
-        z[i] = lst[3]
+    # lines that all have the same number of fields (extra fields included)
+    # are parsed in bulk; a total that merely divides by nlines is not
+    # enough, as lines with different numbers of fields would be mixed up
+    fields = _field_counts(block, _line_starts(block)[0:nlines])
+    if (fields.size == nlines and np.all(fields == fields[0]) and fields[0] >= ncols and
+            values.size == nlines * fields[0]):
+        return values.reshape(nlines, -1)[:, 0:ncols]
 
-    # read element connectivity
-    for j in range(e):
-        f_string = fin.readline()
-        lst = f_string.split()
+    lines = [line.split()[0:ncols] for line in block.splitlines() if line.strip()]
+    return np.array(lines, dtype=np.float64).astype(dtype).reshape(nlines, ncols)
 
-        ikle[j, 0] = int(lst[2])
-        ikle[j, 1] = int(lst[3])
-        ikle[j, 2] = int(lst[4])
 
-    # shift element connectivities so that they are zero-based
-    ikle[:, 0] = ikle[:, 0] - 1
-    ikle[:, 1] = ikle[:, 1] - 1
-    ikle[:, 2] = ikle[:, 2] - 1
+def _join_lines(data, starts, mask):
+    """
+    Joins the lines of a file read as bytes that are selected by mask; each
+    run of consecutive selected lines is taken as a single slice
+    :param bytes data: contents of the file
+    :param starts: line starts, as returned by _line_starts()
+    :param mask: boolean array, True for each line to keep
+    :return: the joined lines, and the number of lines
+    """
+    idx = np.flatnonzero(mask)
+    if idx.size == 0:
+        return b"", 0
 
-    return n, e, x, y, z, ikle
+    breaks = np.flatnonzero(np.diff(idx) != 1)
+    first = np.concatenate(([idx[0]], idx[breaks + 1]))
+    last = np.concatenate((idx[breaks], [idx[-1]]))
 
+    # each slice ends with its newline (except at the end of the file), so
+    # no blank lines are added between the runs
+    block = b"".join([data[starts[i]:starts[j + 1]] for i, j in zip(first, last)])
+    return block, idx.size
 
-def read2dm(two_dm_file):
+
+def setMeshCache(enabled=True, cache_dir=_default_cache_dir):
     """
-    Read an SMS 2dm mesh file
-    :param str two_dm_file: name of an SMS 2dm mesh file
-    :return:
+    Sets up the binary cache used by the mesh readers
+    :param bool enabled: False to always parse the ascii mesh files
+    :param str cache_dir: directory for the cache files (default is ~/.cache/pputils/meshes; None to keep each
+                          cache file next to its mesh)
+    :return: None
     """
-    fin = open(two_dm_file)
+    _mesh_cache["enabled"] = enabled
+    _mesh_cache["dir"] = cache_dir
+    return None
 
-    # https://stackoverflow.com/questions/845058/how-to-get-line-count-of-a-large-file-cheaply-in-python
-    # this code cheaply reads the number of lines of a text file
-    def _make_gen(reader):
-        b = reader(1024 * 1024)
-        while b:
-            yield b
-            b = reader(1024 * 1024)
 
-    def rawgencount(filename):
-        f = open(filename, "rb")
-        f_gen = _make_gen(f.raw.read)
-        return sum(buf.count(b"\n") for buf in f_gen)
+def _cache_file(mesh_file):
+    """
+    Gives the name of the cache file of a mesh
+    :param str mesh_file: absolute path of the mesh file
+    :return: name of the *.npz cache file
+    """
+    if _mesh_cache["dir"] is None:
+        return mesh_file + ".npz"
+    key = hashlib.sha1(mesh_file.encode("utf-8")).hexdigest()[0:16]
+    return os.path.join(_mesh_cache["dir"], key + "_" + os.path.basename(mesh_file) + ".npz")
 
-    num_lines = rawgencount(two_dm_file)
 
-    # the header line contains the total number of lines in the file
-    # which corresponds to the nodes and elements joined in sum n_plus_e
-    n_plus_e = num_lines - 1
+def _cache_key(mesh_file, reader):
+    """
+    Gives the key that a cache file has to match to be valid
+    :param str mesh_file: absolute path of the mesh file
+    :param str reader: name of the reader that parsed the mesh
+    :return: array with the cache version, and the path, reader, size and mtime (in ns) of the mesh file
+    """
+    st = os.stat(mesh_file)
+    mtime = getattr(st, "st_mtime_ns", int(st.st_mtime * 1e9))
+    return np.array([_mesh_cache_version, mesh_file, reader, str(st.st_size), str(mtime)])
 
-    # reads the header line
-    f_string = fin.readline()
 
-    # the number of elements counter
-    e = 0
-    n = 0
+def _load_npz(npz_file):
+    """
+    Loads the arrays of an uncompressed *.npz file as copy-on-write memory maps;
+    each array is mapped at the offset of its data in the zip archive, so
+    nothing is read until the array is used, and changes to the arrays are
+    never written back to the file
+    :param str npz_file: name of the *.npz file
+    :return: dictionary of arrays
+    """
+    arrays = {}
+    with open(npz_file, "rb") as fin:
+        with zipfile.ZipFile(fin) as zf:
+            infos = zf.infolist()
+        for info in infos:
+            name = info.filename[0:-4]
+            if info.compress_type != zipfile.ZIP_STORED:
+                with np.load(npz_file) as npz:
+                    arrays[name] = npz[name]
+                continue
+
+            # skip the local header of the member to get to the *.npy data
+            fin.seek(info.header_offset)
+            header = struct.unpack("<4s5H3I2H", fin.read(30))
+            fin.seek(info.header_offset + 30 + header[9] + header[10])
+            version = np.lib.format.read_magic(fin)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(fin)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(fin)
+
+            if dtype.hasobject or int(np.prod(shape)) == 0:
+                with np.load(npz_file) as npz:
+                    arrays[name] = npz[name]
+            else:
+                arrays[name] = np.memmap(npz_file, dtype=dtype, mode="c", offset=fin.tell(), shape=shape,
+                                         order="F" if fortran_order else "C")
+    return arrays
+
+
+def _cached(reader):
+    """
+    Decorator that keeps the mesh returned by a reader in a binary cache; the
+    cache is keyed by the path, size and mtime of the mesh file, and is
+    rebuilt when the mesh file changes
+    :param reader: function reading a mesh file, returning n, e, x, y, z, ikle
+    :return: the reader using the cache
+    """
+    @functools.wraps(reader)
+    def read(mesh_file):
+        if not _mesh_cache["enabled"]:
+            return reader(mesh_file)
+
+        mesh_file = os.path.abspath(mesh_file)
+        key = _cache_key(mesh_file, reader.__name__)
+        cache_file = _cache_file(mesh_file)
+
+        # use the cache if it is there and up to date
+        if os.path.isfile(cache_file):
+            try:
+                arrays = _load_npz(cache_file)
+                if np.array_equal(arrays["key"], key):
+                    return (int(arrays["n"]), int(arrays["e"]), arrays["x"], arrays["y"], arrays["z"],
+                            arrays["ikle"])
+            except (OSError, IOError, ValueError, KeyError, zipfile.BadZipfile):
+                pass
+
+        # otherwise parse the mesh, and (re)build its cache; the cache is
+        # written to a temporary file first, so that a mesh read by several
+        # scripts at the same time never sees a partial cache file
+        n, e, x, y, z, ikle = reader(mesh_file)
+        tmp_file = cache_file + "." + str(os.getpid()) + ".tmp"
+        try:
+            if _mesh_cache["dir"] is not None and not os.path.isdir(_mesh_cache["dir"]):
+                os.makedirs(_mesh_cache["dir"])
+            with open(tmp_file, "wb") as fout:
+                np.savez(fout, key=key, n=np.array(n), e=np.array(e), x=x, y=y, z=z, ikle=ikle)
+            os.replace(tmp_file, cache_file)
+        except (OSError, IOError):
+            # the cache is optional (e.g., the mesh is in a read-only directory)
+            if os.path.isfile(tmp_file):
+                os.remove(tmp_file)
+
+        return n, e, x, y, z, ikle
+
+    return read
+
+
+@_cached
+def readAdcirc(adcirc_file):
+    """
+    Reads an adcirc (grd) file; the node and element blocks are each
+    parsed in bulk
+    :param str adcirc_file: file name to read
+    :return:
+    """
 
-    # go through each line and count the total number of elements and nodes
-    for i in range(n_plus_e):
-        f_string = fin.readline()
-        three_chars = f_string[0:3]
-        two_chars = f_string[0:2]
+    with open(adcirc_file, "rb") as fin:
+        data = fin.read()
+    starts = _line_starts(data)
+
+    # first line is the title string
+    # second line is e, n
+    title_name = data[starts[1]:starts[2]].split()
+    e = int(title_name[0])
+    n = int(title_name[1])
 
-        if three_chars == "E3T":
-            e = e + 1
-        if two_chars == "ND":
-            n = n + 1
+    # read nodes (node number, x, y, z)
+    nodes = _parse_block(data[starts[2]:starts[2 + n]], n, 4, np.float64)
+    x = nodes[:, 1].copy()
+    y = nodes[:, 2].copy()
+    z = nodes[:, 3].copy()
 
-    fin.close()
+    # read element connectivity (element number, 3, n1, n2, n3)
+    elements = _parse_block(data[starts[2 + n]:starts[2 + n + e]], e, 5, np.int64)
 
-    # open the same file again
-    fin = open(two_dm_file)
+    # shift element connectivities so that they are zero-based
+    ikle = elements[:, 2:5] - 1
 
-    # now we can declare the arrays that are needed to store the values read
-    x = np.zeros(n, dtype=np.float64)
-    y = np.zeros(n, dtype=np.float64)
-    z = np.zeros(n, dtype=np.float64)
+    return n, e, x, y, z, ikle
 
-    ikle = np.zeros((e, 3), dtype=np.int64)
 
-    # counters for nodes and elements
-    node_count = 0
-    ele_count = 0
+@_cached
+def read2dm(two_dm_file):
+    """
+    Read an SMS 2dm mesh file in a single pass; the lines are sorted by card,
+    and the ND, E3T and E4Q blocks are each parsed in bulk; each E4Q element
+    is split in two triangles, and nodestrings (NS) and other cards are
+    skipped
+    :param str two_dm_file: name of an SMS 2dm mesh file
+    :return:
+    """
+    with open(two_dm_file, "rb") as fin:
+        data = fin.read()
+    starts = _line_starts(data)
 
-    # now to fill in x,y,z and ikle arrays
-    for i in range(n_plus_e):
-        f_string = fin.readline()
-        three_chars = f_string[0:3]
-        two_chars = f_string[0:2]
-        tmp = f_string.split(" ")
+    # first three characters of each line give its card
+    chars = np.frombuffer(data + b"   ", dtype=np.uint8)
+    c0 = chars[starts[:-1]]
+    c1 = chars[starts[:-1] + 1]
+    c2 = chars[starts[:-1] + 2]
 
-        if three_chars == "E3T":
-            ele_count = int(tmp[1])
-            ikle[ele_count - 1, 0] = int(tmp[2])
-            ikle[ele_count - 1, 1] = int(tmp[3])
-            ikle[ele_count - 1, 2] = int(tmp[4])
+    is_nd = (c0 == ord("N")) & (c1 == ord("D")) & ((c2 == ord(" ")) | (c2 == ord("\t")))
+    is_e3t = (c0 == ord("E")) & (c1 == ord("3")) & (c2 == ord("T"))
+    is_e4q = (c0 == ord("E")) & (c1 == ord("4")) & (c2 == ord("Q"))
 
-        if two_chars == "ND":
-            node_count = int(tmp[1])
-            x[node_count - 1] = float(tmp[2])
-            y[node_count - 1] = float(tmp[3])
-            z[node_count - 1] = float(tmp[4])
+    # nodes (ND id x y z), stored by node number
+    block, n = _join_lines(data, starts, is_nd)
+    nodes = _parse_block(block.replace(b"ND", b""), n, 4, np.float64)
+    node_ids = nodes[:, 0].astype(np.int64) - 1
 
-    fin.close()
+    x = np.zeros(n, dtype=np.float64)
+    y = np.zeros(n, dtype=np.float64)
+    z = np.zeros(n, dtype=np.float64)
+    x[node_ids] = nodes[:, 1]
+    y[node_ids] = nodes[:, 2]
+    z[node_ids] = nodes[:, 3]
+
+    # triangles (E3T id n1 n2 n3 material)
+    block, e3 = _join_lines(data, starts, is_e3t)
+    tri = _parse_block(block.replace(b"E3T", b""), e3, 4, np.int64)
+
+    # quadrilaterals (E4Q id n1 n2 n3 n4 material)
+    block, e4 = _join_lines(data, starts, is_e4q)
+    quad = _parse_block(block.replace(b"E4Q", b""), e4, 5, np.int64)
+
+    if e4 == 0:
+        ikle = np.zeros((e3, 3), dtype=np.int64)
+        ikle[tri[:, 0] - 1] = tri[:, 1:4]
+    else:
+        # each quadrilateral is split in two triangles, which take its
+        # place in the order of the element numbers
+        ele_ids = np.concatenate((tri[:, 0], quad[:, 0], quad[:, 0]))
+        half = np.concatenate((np.zeros(e3 + e4, dtype=np.int64), np.ones(e4, dtype=np.int64)))
+        tri_nodes = np.concatenate((tri[:, 1:4], quad[:, [1, 2, 3]], quad[:, [1, 3, 4]]))
+        ikle = tri_nodes[np.lexsort((half, ele_ids))]
+
+    e = ikle.shape[0]
 
     # shift the element connectivities, so that they are zero based
-    ikle[:, 0] = ikle[:, 0] - 1
-    ikle[:, 1] = ikle[:, 1] - 1
-    ikle[:, 2] = ikle[:, 2] - 1
+    ikle = ikle - 1
 
     return n, e, x, y, z, ikle
 
 
+@_cached
 def readPly(ply_file):
     """
-    read a poly (line) file
+    read a poly (line) file; the vertex and face blocks are each parsed in bulk
     :param str ply_file: name of a ply_file
     :return:
     """
+    with open(ply_file, "rb") as fin:
+        data = fin.read()
+    starts = _line_starts(data)
 
-    # define lists
-    x = list()
-    y = list()
-    z = list()
-    e1 = list()
-    e2 = list()
-    e3 = list()
-
-    # each line in the file is a list object
-    line = list()
-    with open(ply_file, "r") as f1:
-        for i in f1:
-            line.append(i)
-
-    # reads the nodes from
-    n = line[3].split()[2]
-    n = int(n)
-    e = line[7].split()[2]
-    e = int(e)
-
-    node_str = str("")
-    # read nodes from file
-    for i in range(10, n + 10):
-        node_str = line[i]
-        node_str_list = node_str.split()
-        x.append(node_str_list[0])
-        y.append(node_str_list[1])
-        z.append(node_str_list[2])
-
-    # write the temp elements file
-    for i in range(n + 10, n + 10 + e):
-        ele_str = line[i]
-        ele_str_list = ele_str.split()
-        e1.append(ele_str_list[1])
-        e2.append(ele_str_list[2])
-        e3.append(ele_str_list[3])
-
-    # convert into numpy arrays
-    xx = np.zeros(n)
-    yy = np.zeros(n)
-    zz = np.zeros(n)
-    e11 = np.zeros(e)
-    e22 = np.zeros(e)
-    e33 = np.zeros(e)
-
-    for i in range(0, n):
-        xx[i] = x[i]
-        yy[i] = y[i]
-        zz[i] = z[i]
+    # reads the number of nodes and elements from the header
+    n = 0
+    e = 0
+    i = 0
+    while i < len(starts) - 1:
+        lst = data[starts[i]:starts[i + 1]].split()
+        i = i + 1
+        if lst[0:2] == [b"element", b"vertex"]:
+            n = int(lst[2])
+        if lst[0:2] == [b"element", b"face"]:
+            e = int(lst[2])
+        if lst[0:1] == [b"end_header"]:
+            break
+
+    # read nodes from file (x, y, z)
+    nodes = _parse_block(data[starts[i]:starts[i + n]], n, 3, np.float64)
+    xx = nodes[:, 0].copy()
+    yy = nodes[:, 1].copy()
+    zz = nodes[:, 2].copy()
+
+    # read the elements (3, e1, e2, e3)
+    faces = _parse_block(data[starts[i + n]:starts[i + n + e]], e, 4, np.int64)
 
     # +1 to change index of elements to match
-    for i in range(0, e):
-        e11[i] = int(e1[i]) + 1
-        e22[i] = int(e2[i]) + 1
-        e33[i] = int(e3[i]) + 1
-
-    # stack the elements
-    ikle = np.column_stack((e11, e22, e33))
-    ikle = ikle.astype(np.int32)
+    ikle = (faces[:, 1:4] + 1).astype(np.int32)
 
     return n, e, xx, yy, zz, ikle
 
 
+@_cached
 def readDat(dat_file):
     """
     Reads a .dat mesh file format; stores the ikle indexes as zero based
     :param str dat_file: name of a .dat file
     :return:
     """
-    # open the file
-    fin = open(dat_file, "r")
+    with open(dat_file, "rb") as fin:
+        data = fin.read()
+    starts = _line_starts(data)
 
     # read the first line of the *.dat file (and get nodes and elements)
-    line = fin.readline()
-    n = int(line.split()[0])
-    e = int(line.split()[1])  # includes the 1d elements too
-
-    # define numpy arrays to store the mesh data
-    x = np.zeros(n, dtype=np.float64)
-    y = np.zeros(n, dtype=np.float64)
-    z = np.zeros(n, dtype=np.float64)
-
-    # this is the ikle array, but it has the shape that includes all elements (1d+2d)
-    ikle = np.zeros((e, 3), dtype=np.int64)
-
-    # element type flag in the *.dat mesh (103 = 1d mesh; 203 = 2d mesh)
-    mesh_flag = np.zeros(e, dtype=np.int64)
-
-    # read the *.dat file line by line, and store into arrays (read nodes)
-    for i in range(n):
-        # reads the file from the file stream as a string
-        line = fin.readline()
-
-        # converts the line as a list of strings
-        lst = line.split()
-
-        # do not have to read the node number (at lst[0])
-        x[i] = float(lst[1])
-        y[i] = float(lst[2])
-        z[i] = float(lst[3])
-
-    # store the elements into the ikle array, starting wit a count for 2d elements
-    count = 0
-
-    # read elements
-    for i in range(e):
-        # reads the file from the file stream as a string
-        line = fin.readline()
-
-        # converts the line as a list of strings
-        lst = line.split()
-
-        # store the mesh flag (convert string to an integer)
-        mesh_flag[i] = int(lst[1])
-
-        # store everything in the ikle array (1d+2d)
-        # count the ones that are 203 (these are 2d elements)
-        if mesh_flag[i] == 203:
-            ikle[i, 0] = lst[2]
-            ikle[i, 1] = lst[3]
-            ikle[i, 2] = lst[4]
-
-            # update the count
-            count = count + 1
-
-    # define the ikle2d array through the number of 2d elements
-    ikle2d = np.zeros((count, 3), dtype=np.int64)
-
-    # go through the ikle array, and write only the 2d elements to the ikle2d array
-    a = 0
-    for i in range(e):
-        if mesh_flag[i] == 203:
-            ikle2d[a, 0] = ikle[i, 0]
-            ikle2d[a, 1] = ikle[i, 1]
-            ikle2d[a, 2] = ikle[i, 2]
-
-            # increment the counter
-            a = a + 1
-
-    # the number of 2d elements is this
-    e = count
+    lst = data[starts[0]:starts[1]].split()
+    n = int(lst[0])
+    e = int(lst[1])  # includes the 1d elements too
+
+    # read nodes (do not have to keep the node number)
+    nodes = _parse_block(data[starts[1]:starts[1 + n]], n, 4, np.float64)
+    x = nodes[:, 1].copy()
+    y = nodes[:, 2].copy()
+    z = nodes[:, 3].copy()
+
+    # the element lines have a different number of fields for 1d and 2d
+    # elements, so all values are parsed at once, and the first value of
+    # each line is found from the number of fields on each line
+    block = data[starts[1 + n]:starts[1 + n + e]]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        values = np.fromstring(block.decode(), dtype=np.int64, sep=" ")
+
+    fields = _field_counts(block, starts[1 + n:1 + n + e] - starts[1 + n])
+    first = np.concatenate(([0], np.cumsum(fields)[:-1]))
+
+    # element type flag in the *.dat mesh (103 = 1d mesh; 203 = 2d mesh);
+    # only the 2d elements are kept
+    mesh_flag = values[first + 1]
+    first = first[mesh_flag == 203]
 
     # change the indexes of the ikle2d array to zero based
-    ikle2d[:, 0] = ikle2d[:, 0] - 1
-    ikle2d[:, 1] = ikle2d[:, 1] - 1
-    ikle2d[:, 2] = ikle2d[:, 2] - 1
+    ikle2d = np.column_stack((values[first + 2], values[first + 3], values[first + 4])) - 1
 
-    # close the input file
-    fin.close()
+    # the number of 2d elements is this
+    e = len(first)
 
     return n, e, x, y, z, ikle2d
@@ -16,6 +16,7 @@
 # Revised: Apr 30, 2016
 # Added ability to read 3d *.slf files.
 # Can not write 3d *.slf files yet, but this could be added in the future.
+# (3d *.slf files can be written since Oct 17, 2026; see setNPLAN())
 #
 # Revised: Jun 21, 2016
 # Added a method readVariablesAtNode() that works super fast at extracting
@@ -33,15 +34,80 @@
 # Revised: Nov 24, 2019
 # Made the change recommended by Qilong Bi to work in writing 3d files.
 #
+# Revised: Oct 17, 2026
+# readHeader() reads the IKLE, IPOBO, x and y records as whole blocks,
+# and decodes them with numpy instead of unpacking one value at a time.
+# readTimes() stores the byte offset of each frame, so that readVariables()
+# seeks directly to the desired time step instead of scanning the file.
+# Added mapVariables(), which memory maps the data section of the file and
+# returns a [time, variable, node] view for files too large to load.
+# writeHeader() and writeVariables() convert whole arrays to big endian and
+# write each record at once. The time record marker now holds the size of
+# the time value (8 for double precision files), as TELEMAC expects.
+# Added readVariablesAtNodes(), which extracts time series at many nodes in
+# one pass through the file.
+# readVariables() takes an optional list of variable indices or names, and
+# reads only those records of the frame.
+# Added iterFrames(), a generator over (time, frame) that prefetches frames
+# in a background thread.
+# Added writeIndex() and readIndex(), which keep a sidecar *.slfidx file with
+# the frame times, frame offsets and per frame statistics of each variable.
+# Added writeNodeMajor() and class ppSELAFINts, a node major companion file
+# for fast extraction of time series at many nodes.
+# Added copyFrames(), which copies frame records between files byte for
+# byte, when only the header changes or frames are being picked.
+# Added setNPLAN() to write 3d files, and readPlanes(), readPlaneSeries()
+# and mapPlanes() to read 3d files one plane at a time.
+# Added setNativePrecision(), an opt in mode that keeps values read in the
+# precision of the file, and re-uses the frame array between reads.
+# Added computeEnvelope() and mergeEnvelopes(), for per node max, min,
+# mean, time of max and exceedance duration over all time steps.
+# Added compareMesh(), a vectorized check that two files share a mesh.
+# Added class ppSELAFINset, which reads several *.slf files on the same mesh
+# (restart segments of one run) as one file with a continuous time axis.
+# Added getTimeBracket(), getTimeIndex() and readVariablesAtTime(), which
+# find frames by model time or by date (relative to DATE) with a binary
+# search of the frame times.
+# readTimes() stops at the last frame that is complete in the file, instead
+# of relying on a read error at the end of the file. Added validateFrames(),
+# which checks the record markers of every frame without reading any data,
+# and repairFile(), which truncates (or copies out) the valid part of a
+# file left incomplete by a crashed or still running simulation.
+# Added writeArchive() and class ppSELAFINz, a compressed archive format
+# (*.slfz) that stores each variable of each chunk of frames separately
+# (zlib or lzma, optionally quantized to a tolerance), and is read through
+# the same methods as ppSELAFIN. Added openSELAFIN(), which returns the
+# reader that fits the name of the file (or list of files) given.
+# The file given to the constructor can also be an open binary file object
+# (e.g., io.BytesIO) or, for reading, a buffer (bytes, bytearray or
+# memoryview), so that results can be passed between scripts in memory.
+#
 # Uses: Python 2 or 3, Numpy
 #
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # Global Imports
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 from struct import unpack, pack
+import os
 import sys
+import io
+import bisect
+import threading
+import zlib
+from datetime import datetime
 import numpy as np
 
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+# lzma is in the standard library of python 3 only
+try:
+    import lzma
+except ImportError:
+    lzma = None
+
 
 #
 class ppSELAFIN:
@@ -97,15 +163,80 @@ class ppSELAFIN:
 
         self.time = []
 
+        # byte offset of each frame in the file (filled by readTimes)
+        self.frame_offsets = []
+
+        # byte offset of the first frame (filled by readHeader)
+        self.data_start = 0
+
+        # memory mapped [time, variable, node] view (filled by mapVariables)
+        self.vmap = None
+
+        # [time, variable, 3] array of min, max and mean of each variable in
+        # each frame (filled by writeIndex or readIndex)
+        self.varStats = np.zeros((0, 0, 3))
+
         # temporary array that hold results read for a single time step
         # for each variable in the file
         self.temp = np.zeros((self.NBV1, self.NPOIN))
 
         self.tempAtNode = np.zeros((0, 0))
 
+        # [node, time, variable] array filled by readVariablesAtNodes
+        self.tempAtNodes = np.zeros((0, 0, 0))
+
+        # [plane, node2d] array filled by readPlanes, and [time, node2d]
+        # array filled by readPlaneSeries (for 3d files)
+        self.tempPlanes = np.zeros((0, 0))
+        self.tempPlaneSeries = np.zeros((0, 0))
+
+        # when True (see setNativePrecision), values read are kept in the
+        # file's precision (float32 for single precision files) instead of
+        # float64, and readVariables() re-uses self.temp between calls
+        self.native = False
+
+        # True when the frames are stored as SELAFIN records at
+        # frame_offsets, so that copyFrames() can copy their bytes
+        self.raw_frames = True
+
+        # True when self.f was opened by this object (and is closed by it)
+        self.own_file = True
+
     # methods start here
+    def isBuffer(self):
+        # True when slf_file is a buffer (bytes, bytearray or memoryview)
+        if isinstance(self.slf_file, (bytearray, memoryview)):
+            return True
+        return (self.version == 3 and isinstance(self.slf_file, bytes))
+
+    def isPath(self):
+        # True when slf_file is the name of a file, and False when it is a
+        # buffer or an open file object
+        return not (self.isBuffer() or hasattr(self.slf_file, 'read') or
+                    hasattr(self.slf_file, 'write'))
+
+    def openFile(self, mode):
+        # opens slf_file in mode ('rb' or 'wb'); a buffer is read through an
+        # io.BytesIO, and an open file object (which has to be seekable) is
+        # used as is, from its start
+        if self.isBuffer():
+            if (mode != 'rb'):
+                raise ValueError('Buffers can only be read; use an io.BytesIO to write')
+            self.own_file = True
+            return io.BytesIO(self.slf_file)
+        if self.isPath():
+            self.own_file = True
+            return open(self.slf_file, mode)
+        self.own_file = False
+        self.slf_file.seek(0)
+        return self.slf_file
+
     def readHeader(self):
-        self.f = open(self.slf_file, 'rb')
+        self.f = self.openFile('rb')
+        self.readHeaderRecords()
+
+    def readHeaderRecords(self):
+        # reads the header records from the current position of self.f
         garbage = unpack('>i', self.f.read(4))[0]
 
         if (self.version == 2):
@@ -178,23 +309,20 @@ class ppSELAFIN:
         dummy = unpack('>i', self.f.read(4))[0]
         garbage = unpack('>i', self.f.read(4))[0]
 
-        self.IKLE = np.zeros((self.NELEM, self.NDP), dtype=np.int32)
-
+        # connectivity, boundary and coordinate records are read as whole
+        # blocks and decoded into numpy arrays in one step (big endian)
         garbage = unpack('>i', self.f.read(4))[0]
-        for i in range(self.NELEM):
-            for j in range(self.NDP):
-                self.IKLE[i, j] = unpack('>l', self.f.read(4))[0]
+        self.IKLE = np.frombuffer(self.f.read(4 * self.NELEM * self.NDP),
+                                  dtype='>i4').astype(np.int32)
+        self.IKLE = self.IKLE.reshape(self.NELEM, self.NDP)
         garbage = unpack('>i', self.f.read(4))[0]
 
-        self.IPOBO = np.zeros(self.NPOIN, dtype=np.int32)
-
         garbage = unpack('>i', self.f.read(4))[0]
-        for i in range(self.NPOIN):
-            self.IPOBO[i] = unpack('>l', self.f.read(4))[0]
+        self.IPOBO = np.frombuffer(self.f.read(4 * self.NPOIN),
+                                   dtype='>i4').astype(np.int32)
         garbage = unpack('>i', self.f.read(4))[0]
 
         # reads x
-        self.x = np.zeros(self.NPOIN)
         garbage = unpack('>i', self.f.read(4))[0]
 
         # this is where we decide if it is single of double precision
@@ -204,19 +332,21 @@ class ppSELAFIN:
             self.float_type = 'd'
             self.float_size = 8
 
-        for i in range(self.NPOIN):
-            self.x[i] = unpack('>' + self.float_type, self.f.read(self.float_size))[0]
+        self.x = np.frombuffer(self.f.read(self.float_size * self.NPOIN),
+                               dtype='>' + self.float_type).astype(self.getValuesDtype())
         garbage = unpack('>i', self.f.read(4))[0]
 
         # reads y
-        self.y = np.zeros(self.NPOIN)
         garbage = unpack('>i', self.f.read(4))[0]
-        for i in range(self.NPOIN):
-            self.y[i] = unpack('>' + self.float_type, self.f.read(self.float_size))[0]
+        self.y = np.frombuffer(self.f.read(self.float_size * self.NPOIN),
+                               dtype='>' + self.float_type).astype(self.getValuesDtype())
         garbage = unpack('>i', self.f.read(4))[0]
 
+        # this is where the first time step starts
+        self.data_start = self.f.tell()
+
     def writeHeader(self):
-        self.f = open(self.slf_file, 'wb')
+        self.f = self.openFile('wb')
 
         # added on 2016.06.23 thanks to Yoann Audouin
         # before writing the variable names, make sure they are padded with spaces!
@@ -248,47 +378,42 @@ class ppSELAFIN:
             self.f.write(pack('>16s', self.vunits[i].encode()))
             self.f.write(pack('>i', 32))
 
+        # for 3d files the number of planes is stored in IPARAM[6]
+        IPARAM = list(self.IPARAM)
+        if (self.NPLAN > 1):
+            IPARAM[6] = self.NPLAN
+
         self.f.write(pack('>i', 40))
-        for i in range(len(self.IPARAM)):
-            self.f.write(pack('>i', self.IPARAM[i]))
+        self.f.write(pack('>10i', *IPARAM))
         self.f.write(pack('>i', 40))
 
         if (self.IPARAM[-1] == 1):
             self.f.write(pack('>i', 24))
             # date is 6 integers stored as a list
-            for i in range(len(self.DATE)):
-                self.f.write(pack('>i', self.DATE[i]))
+            self.f.write(pack('>6i', *self.DATE))
             self.f.write(pack('>i', 24))
 
         self.f.write(pack('>i', 16))
         self.f.write(pack('>i', self.NELEM))
         self.f.write(pack('>i', self.NPOIN))
         self.f.write(pack('>i', self.NDP))
-        self.f.write(pack('>i', 1))  # NPLAN???
+        self.f.write(pack('>i', 1))  # always 1; NPLAN is in IPARAM[6]
         self.f.write(pack('>i', 16))
 
-        self.f.write(pack('>i', 4 * self.NELEM * self.NDP))
-        for i in range(self.NELEM):
-            for j in range(self.NDP):
-                self.f.write(pack('>i', self.IKLE[i, j]))
-        self.f.write(pack('>i', 4 * self.NELEM * self.NDP))
-
-        self.f.write(pack('>i', 4 * self.NPOIN))
-        for i in range(len(self.IPOBO)):
-            self.f.write(pack('>i', self.IPOBO[i]))
-        self.f.write(pack('>i', 4 * self.NPOIN))
+        # the arrays are converted to big endian as a whole, and each
+        # record is written with a single write
+        self.writeRecord(np.asarray(self.IKLE, dtype='>i4'))
+        self.writeRecord(np.asarray(self.IPOBO, dtype='>i4'))
 
         # this is the garbage record that determines the float size
         # I have no idea why this works, but it does!!!
-        self.f.write(pack('>i', self.float_size * self.NPOIN))
-        for i in range(len(self.x)):
-            self.f.write(pack('>' + self.float_type, self.x[i]))
-        self.f.write(pack('>i', self.float_size * self.NPOIN))
+        self.writeRecord(np.asarray(self.x, dtype='>' + self.float_type))
+        self.writeRecord(np.asarray(self.y, dtype='>' + self.float_type))
 
-        self.f.write(pack('>i', self.float_size * self.NPOIN))
-        for i in range(len(self.y)):
-            self.f.write(pack('>' + self.float_type, self.y[i]))
-        self.f.write(pack('>i', self.float_size * self.NPOIN))
+    def writeRecord(self, a):
+        # writes array a (already in big endian) as one fortran record
+        marker = pack('>i', a.nbytes)
+        self.f.write(marker + a.tobytes() + marker)
 
     def writeVariables(self, time, temp):
         # appends object's time
@@ -297,76 +422,496 @@ class ppSELAFIN:
         # keeps only the current 2d array in object's memory
         self.temp = temp
 
-        # write the time
-        self.f.write(pack('>i', 4))
-        self.f.write(pack('>' + self.float_type, time))
-        self.f.write(pack('>i', 4))
+        # the whole frame is assembled in memory, and written at once;
+        # record markers hold the size of the record (4 or 8 for the time)
+        frame = [pack('>i', self.float_size),
+                 pack('>' + self.float_type, time),
+                 pack('>i', self.float_size)]
 
         # writes the rest of the variables
+        data = np.asarray(self.temp, dtype='>' + self.float_type)
+        marker = pack('>i', self.float_size * self.NPOIN)
         for j in range(self.NBV1):
-            self.f.write(pack('>i', self.float_size * self.NPOIN))
-            for k in range(self.NPOIN):
-                self.f.write(pack('>' + self.float_type, self.temp[j, k]))
-            self.f.write(pack('>i', self.float_size * self.NPOIN))
+            frame.append(marker)
+            frame.append(data[j, :self.NPOIN].tobytes())
+            frame.append(marker)
+
+        self.f.write(b''.join(frame))
+
+    def copyFrames(self, src, frames=None, times=None, block_size=16 * 1024 * 1024):
+        # appends frames of the ppSELAFIN object src (already read with
+        # readHeader) to this file (after writeHeader); frames is a list of
+        # time step indices of src (default is all of them), and times is an
+        # optional list of times to write instead of the ones in src
+
+        # when precision and layout match, the frame records are copied
+        # byte for byte in blocks of block_size, without decoding anything;
+        # otherwise each frame is decoded and written with writeVariables()
+        if (len(src.frame_offsets) == 0):
+            src.readTimes()
+        if (frames is None):
+            frames = list(range(len(src.frame_offsets)))
+
+        pos_prior_to_copy = src.f.tell()
+
+        if (src.float_size != self.float_size or src.NBV1 != self.NBV1 or
+                src.NPOIN != self.NPOIN or not src.raw_frames):
+            for k in range(len(frames)):
+                if (times is None):
+                    time = src.time[frames[k]]
+                else:
+                    time = times[k]
+                self.writeVariables(time, src.readFrame(src.getFrameFile(frames[k]), frames[k],
+                                                        range(src.NBV1)))
+            src.f.seek(pos_prior_to_copy)
+            return
+
+        time_size = 4 + self.float_size + 4
+        frame_size = time_size + self.NBV1 * (4 + self.float_size * self.NPOIN + 4)
+
+        if (times is None):
+            # runs of consecutive frames that are contiguous in the same
+            # file are copied as one block
+            k = 0
+            while (k < len(frames)):
+                f = src.getFrameFile(frames[k])
+                n = 1
+                while (k + n < len(frames) and frames[k + n] == frames[k] + n and
+                       src.getFrameFile(frames[k + n]) is f and
+                       src.frame_offsets[frames[k + n]] ==
+                       src.frame_offsets[frames[k]] + n * frame_size):
+                    n = n + 1
+                f.seek(src.frame_offsets[frames[k]])
+                self.copyBytes(f, n * frame_size, block_size)
+                for j in range(k, k + n):
+                    self.time.append(src.time[frames[j]])
+                k = k + n
+        else:
+            # new time records are written, and the variables copied
+            for k in range(len(frames)):
+                self.f.write(pack('>i', self.float_size) +
+                             pack('>' + self.float_type, times[k]) +
+                             pack('>i', self.float_size))
+                f = src.getFrameFile(frames[k])
+                f.seek(src.frame_offsets[frames[k]] + time_size)
+                self.copyBytes(f, frame_size - time_size, block_size)
+                self.time.append(times[k])
+
+        src.f.seek(pos_prior_to_copy)
+
+    def copyBytes(self, f, nbytes, block_size=16 * 1024 * 1024):
+        # copies nbytes from the current position of the open file f to
+        # this file, in blocks of block_size
+        while (nbytes > 0):
+            buf = f.read(min(nbytes, block_size))
+            if not buf:
+                break
+            self.f.write(buf)
+            nbytes = nbytes - len(buf)
 
     def readTimes(self):
         pos_prior_to_time_reading = self.f.tell()
 
-        while True:
-            try:
-                # get the times
-                self.f.seek(4, 1)
-                self.time.append(unpack('>' + self.float_type, self.f.read(self.float_size))[0])
-                self.f.seek(4, 1)
+        # byte offset of each frame (i.e., of the time record that starts
+        # each time step) is stored so readVariables() can seek straight to it
+        self.time = []
+        self.frame_offsets = []
 
-                # skip through the variables
-                self.f.seek(self.NBV1 * (4 + self.float_size * self.NPOIN + 4), 1)
+        # only frames that are complete in the file are read; a partial
+        # frame at the end (from a simulation that crashed or is still
+        # running) is left out
+        self.f.seek(0, 2)
+        file_size = self.f.tell()
+
+        # 4 at begining and end of each record are the record markers
+        frame_size = (4 + self.float_size + 4 +
+                      self.NBV1 * (4 + self.float_size * self.NPOIN + 4))
+
+        frame_start = pos_prior_to_time_reading
+        while (frame_start + frame_size <= file_size):
+            # get the times
+            self.f.seek(frame_start + 4)
+            self.time.append(unpack('>' + self.float_type, self.f.read(self.float_size))[0])
+            self.frame_offsets.append(frame_start)
+
+            # skip through the variables
+            frame_start = frame_start + frame_size
 
-                # skip the variables
-                # 4 at begining and end are garbage
-                # 4*NPOIN assumes each times step there are NPOIN nodes of
-                # size 4 bytes (i.e., single precision)
-                # f.seek(NBV1*(4+4*NPOIN+4), 1)
-            except:
-                break
         self.f.seek(pos_prior_to_time_reading)
 
-    def readVariables(self, t_des):
+    def validateFrames(self):
+        # checks the Fortran record markers of every frame, by seeking to
+        # them; no data is read or decoded; returns the number of complete
+        # frames (those with all their markers in place), the size in bytes
+        # of the valid part of the file (header and complete frames before
+        # the first bad or partial frame), and the size of the file
+        pos_prior_to_validation = self.f.tell()
+
+        self.f.seek(0, 2)
+        file_size = self.f.tell()
+
+        time_size = 4 + self.float_size + 4
+        rec_size = 4 + self.float_size * self.NPOIN + 4
+        frame_size = time_size + self.NBV1 * rec_size
+
+        # files written before Oct 17, 2026 have a time marker of 4 in double
+        # precision files as well
+        time_markers = (pack('>i', self.float_size), pack('>i', 4))
+        rec_marker = pack('>i', self.float_size * self.NPOIN)
+
+        numFrames = 0
+        frame_start = self.data_start
+        while (frame_start + frame_size <= file_size):
+            self.f.seek(frame_start)
+            marker = self.f.read(4)
+            if marker not in time_markers:
+                break
+            self.f.seek(frame_start + 4 + self.float_size)
+            if (self.f.read(4) != marker):
+                break
+
+            # the end marker of each record is followed by the start marker
+            # of the next one, so they are read together
+            rec_start = frame_start + time_size
+            self.f.seek(rec_start)
+            complete = (self.f.read(4) == rec_marker)
+            for i in range(self.NBV1):
+                if not complete:
+                    break
+                self.f.seek(rec_start + rec_size - 4)
+                if (i < self.NBV1 - 1):
+                    complete = (self.f.read(8) == rec_marker + rec_marker)
+                else:
+                    complete = (self.f.read(4) == rec_marker)
+                rec_start = rec_start + rec_size
+            if not complete:
+                break
+
+            numFrames = numFrames + 1
+            frame_start = frame_start + frame_size
+
+        self.f.seek(pos_prior_to_validation)
+
+        return numFrames, frame_start, file_size
+
+    def repairFile(self, out_file=None, block_size=16 * 1024 * 1024):
+        # keeps the header and the complete frames found by validateFrames();
+        # they are copied to out_file, or when out_file is None the *.slf
+        # file itself is truncated after them; returns the number of frames
+        # kept
+        numFrames, valid_size, file_size = self.validateFrames()
+
+        if (out_file is None):
+            if (valid_size < file_size):
+                if self.isPath():
+                    with open(self.slf_file, 'r+b') as f:
+                        f.truncate(valid_size)
+                else:
+                    self.f.truncate(valid_size)
+        else:
+            pos_prior_to_copy = self.f.tell()
+            self.f.seek(0)
+            with open(out_file, 'wb') as fout:
+                nbytes = valid_size
+                while (nbytes > 0):
+                    buf = self.f.read(min(nbytes, block_size))
+                    if not buf:
+                        break
+                    fout.write(buf)
+                    nbytes = nbytes - len(buf)
+            self.f.seek(pos_prior_to_copy)
+
+        # frame times and offsets have to be read again
+        self.time = []
+        self.frame_offsets = []
+
+        return numFrames
+
+    def readVariables(self, t_des, variables=None):
         # print('Desired time: ' + str(t_des) + '\n')
         pos_prior_to_var_reading = self.f.tell()
 
+        # frame offsets are only known once the times have been read
+        if (len(self.frame_offsets) == 0):
+            self.readTimes()
+
+        # variables is an optional list of variable indices or names; when
+        # given, only those records are read (the rest are skipped over),
+        # and the rows of self.temp follow the order of the list
+        if (variables is None):
+            var_idx = list(range(self.NBV1))
+        else:
+            var_idx = [self.getVarIndex(v) for v in variables]
+
         # reads data for all variables in the *.slf file at desired time t_des
-        self.temp = np.zeros((self.NBV1, self.NPOIN))
+        if (t_des < 0 or t_des >= len(self.frame_offsets)):
+            self.temp = np.zeros((len(var_idx), self.NPOIN), dtype=self.getValuesDtype())
+            return
 
-        # it reads the time again, but this it is not used
-        time2 = []
+        # in native mode the previous self.temp is filled in place when it
+        # has the right shape, so no new array is allocated for each frame
+        out = None
+        if (self.native and self.temp.shape == (len(var_idx), self.NPOIN) and
+                self.temp.dtype == self.getValuesDtype()):
+            out = self.temp
 
-        # time index
-        t = -1
+        self.temp = self.readFrame(self.f, t_des, var_idx, out)
 
-        while True:
+        # need to re-set in case another variable needs to be read!
+        self.f.seek(pos_prior_to_var_reading)
+
+    def getFrameFile(self, t_des):
+        # open file that holds frame t_des (at offset frame_offsets[t_des])
+        return self.f
+
+    def readFrame(self, f, t_des, var_idx, out=None):
+        # reads the records of variables var_idx (list of indices) of frame
+        # t_des from the open file f, and returns them as [variable, node];
+        # when all variables are wanted the frame is read as one block,
+        # otherwise the records not wanted are skipped over; if given, the
+        # [variable, node] array out is filled and returned
+        var_start = self.frame_offsets[t_des] + 4 + self.float_size + 4
+        rec_size = 4 + self.float_size * self.NPOIN + 4
+        dtype = '>' + self.float_type
+
+        if (out is None):
+            frame = np.zeros((len(var_idx), self.NPOIN), dtype=self.getValuesDtype())
+        else:
+            frame = out
+
+        if (list(var_idx) == list(range(self.NBV1))):
+            f.seek(var_start)
+            buf = f.read(self.NBV1 * rec_size)
+            for i in range(self.NBV1):
+                frame[i, :] = np.frombuffer(buf, dtype=dtype, count=self.NPOIN,
+                                            offset=i * rec_size + 4)
+        else:
+            for i in range(len(var_idx)):
+                f.seek(var_start + var_idx[i] * rec_size + 4)
+                frame[i, :] = np.frombuffer(f.read(self.float_size * self.NPOIN),
+                                            dtype=dtype)
+
+        return frame
+
+    def iterFrames(self, t_start=0, t_end=None, stride=1, variables=None, prefetch=4,
+                   frames=None):
+        # returns a generator that yields (time, frame) for time step indices
+        # t_start, t_start + stride, ... up to and including t_end (default
+        # is the last time step), or for the time step indices in the list
+        # frames; frame is a [variable, node] array, restricted to the list
+        # variables if given (as in readVariables); the indices are checked
+        # here, so an index out of range raises ValueError at the call
+        # rather than once the frames are being read
+
+        # a reader thread prefetches up to prefetch frames into a bounded
+        # queue, so reading from disk overlaps with the caller's work on the
+        # current frame; it reads through its own file handle, so the
+        # position of self.f is left alone
+        if (len(self.frame_offsets) == 0):
+            self.readTimes()
+        numFrames = len(self.frame_offsets)
+
+        if (frames is not None):
+            idx_list = list(frames)
+        else:
+            if (stride < 1):
+                raise ValueError('Stride ' + str(stride) + ' must be at least 1')
+            if (t_end is None):
+                t_end = numFrames - 1
+            elif (t_end < 0 or t_end >= numFrames):
+                raise ValueError('Time step index ' + str(t_end) + ' out of range')
+            if (numFrames > 0 and (t_start < 0 or t_start >= numFrames)):
+                raise ValueError('Time step index ' + str(t_start) + ' out of range')
+            idx_list = list(range(t_start, t_end + 1, stride))
+
+        for t in idx_list:
+            if (t < 0 or t >= numFrames):
+                raise ValueError('Time step index ' + str(t) + ' out of range')
+
+        if (variables is None):
+            var_idx = list(range(self.NBV1))
+        else:
+            var_idx = [self.getVarIndex(v) for v in variables]
+
+        return self.generateFrames(idx_list, var_idx, prefetch)
+
+    def generateFrames(self, idx_list, var_idx, prefetch):
+        # the generator behind iterFrames(); the indices in idx_list and
+        # var_idx have already been checked
+
+        # a buffer or an open file object can not be opened a second time,
+        # so its frames are read in turn through self.f, without the thread
+        if not self.isPath():
+            for t in idx_list:
+                pos_prior_to_var_reading = self.f.tell()
+                frame = self.readFrame(self.f, t, var_idx)
+                self.f.seek(pos_prior_to_var_reading)
+                yield self.time[t], frame
+            return
+
+        frames = queue.Queue(maxsize=max(1, prefetch))
+        stop = threading.Event()
+
+        def put(item):
+            # gives up if the consumer stopped iterating
+            while not stop.is_set():
+                try:
+                    frames.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def reader():
             try:
-                self.f.seek(4, 1)
-                time2.append(unpack('>' + self.float_type, self.f.read(self.float_size))[0])
-                self.f.seek(4, 1)
+                with open(self.slf_file, 'rb') as f:
+                    for t in idx_list:
+                        frame = self.readFrame(f, t, var_idx)
+                        if not put((self.time[t], frame)):
+                            return
+                put(None)
+            except Exception as e:
+                put(e)
+
+        thread = threading.Thread(target=reader)
+        thread.daemon = True
+        thread.start()
+
+        try:
+            while True:
+                item = frames.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            thread.join()
+
+    def getTimeBracket(self, time):
+        # binary search of the frame times for time, given as model time (in
+        # seconds) or as a python datetime (converted with DATE); returns the
+        # indices t0 <= t1 of the frames on either side of time, and the
+        # weight w of frame t1 for linear interpolation between them; times
+        # before the first or after the last frame give that frame, w = 0
+        if isinstance(time, datetime):
+            time = self.getTimeFromDate(time)
+
+        if (len(self.frame_offsets) == 0):
+            self.readTimes()
+        numTimes = len(self.time)
+        if (numTimes == 0):
+            raise ValueError('No time steps in ' + str(self.slf_file))
+
+        k = bisect.bisect_left(self.time, time)
+        if (k == 0):
+            return 0, 0, 0.0
+        if (k == numTimes):
+            return numTimes - 1, numTimes - 1, 0.0
+        if (self.time[k] == time):
+            return k, k, 0.0
+        return k - 1, k, (time - self.time[k - 1]) / (self.time[k] - self.time[k - 1])
+
+    def getTimeIndex(self, time):
+        # index of the frame nearest to time (model time or datetime); ties
+        # go to the earlier frame
+        t0, t1, w = self.getTimeBracket(time)
+        if (w > 0.5):
+            return t1
+        return t0
+
+    def readVariablesAtTime(self, time, variables=None, interpolate=False):
+        # same as readVariables(), for the frame nearest to time (model time
+        # or datetime); with interpolate=True the values are interpolated
+        # linearly in time between the frames on either side
+        t0, t1, w = self.getTimeBracket(time)
+
+        if not interpolate or w == 0.0:
+            if (w > 0.5):
+                self.readVariables(t1, variables)
+            else:
+                self.readVariables(t0, variables)
+            return
 
-                t = t + 1
+        self.readVariables(t0, variables)
+        temp0 = self.temp.copy()
+        self.readVariables(t1, variables)
+        self.temp = (temp0 + w * (self.temp - temp0)).astype(self.getValuesDtype())
 
-                if (t == t_des):
-                    # print('slf time: ' + str(t))
-                    for i in range(self.NBV1):
-                        self.f.seek(4, 1)
-                        for j in range(self.NPOIN):
-                            self.temp[i, j] = unpack('>' + self.float_type, self.f.read(self.float_size))[0]
-                        self.f.seek(4, 1)
-                else:
-                    self.f.seek(self.NBV1 * (4 + self.float_size * self.NPOIN + 4), 1)
-            except:
-                break
+    def readPlanes(self, t_des, var):
+        # reads variable var (index or name) of frame t_des of a 3d file as
+        # a [plane, node2d] array; only that variable's record is read
+        pos_prior_to_var_reading = self.f.tell()
+
+        if (len(self.frame_offsets) == 0):
+            self.readTimes()
+
+        frame = self.readFrame(self.f, t_des, [self.getVarIndex(var)])
+        self.tempPlanes = frame.reshape(self.NPLAN, self.getNPOIN2())
 
-        # need to re-set in case another variable needs to be read!
         self.f.seek(pos_prior_to_var_reading)
 
+    def readPlaneSeries(self, plane, var):
+        # reads variable var (index or name) on plane plane of a 3d file, for
+        # all times, as a [time, node2d] array; only that plane's part of
+        # each variable record is read
+        pos_prior_to_var_reading = self.f.tell()
+
+        if (len(self.frame_offsets) == 0):
+            self.readTimes()
+
+        NPOIN2 = self.getNPOIN2()
+        rec_size = 4 + self.float_size * self.NPOIN + 4
+        plane_start = (4 + self.float_size + 4 + self.getVarIndex(var) * rec_size + 4 +
+                       plane * NPOIN2 * self.float_size)
+
+        self.tempPlaneSeries = np.zeros((len(self.frame_offsets), NPOIN2),
+                                        dtype=self.getValuesDtype())
+        for t in range(len(self.frame_offsets)):
+            f = self.getFrameFile(t)
+            f.seek(self.frame_offsets[t] + plane_start)
+            self.tempPlaneSeries[t, :] = np.frombuffer(f.read(self.float_size * NPOIN2),
+                                                       dtype='>' + self.float_type)
+
+        self.f.seek(pos_prior_to_var_reading)
+
+    def computeEnvelope(self, variables, threshold, t_start=0, t_end=None):
+        # streams frames t_start to t_end (inclusive, default is the last
+        # one) once, and reduces each of the variables (indices or names)
+        # node by node; returns [variable, node] arrays of the max, min, sum
+        # (for the mean), time of max and duration above threshold, and the
+        # number of frames reduced; the duration counts the time from the
+        # previous frame for each frame above threshold, so results of
+        # consecutive frame ranges can be merged with mergeEnvelopes()
+        if (len(self.frame_offsets) == 0):
+            self.readTimes()
+        if (t_end is None):
+            t_end = len(self.frame_offsets) - 1
+
+        var_idx = [self.getVarIndex(v) for v in variables]
+        shape = (len(var_idx), self.NPOIN)
+
+        vmax = np.full(shape, -np.inf)
+        vmin = np.full(shape, np.inf)
+        vsum = np.zeros(shape)
+        tmax = np.zeros(shape)
+        dur = np.zeros(shape)
+        count = 0
+
+        for t, (time, frame) in enumerate(self.iterFrames(t_start, t_end, variables=var_idx),
+                                          start=t_start):
+            above = frame > vmax
+            vmax = np.where(above, frame, vmax)
+            tmax = np.where(above, time, tmax)
+            np.minimum(vmin, frame, out=vmin)
+            vsum += frame
+            if (t > 0):
+                dur += (time - self.time[t - 1]) * (frame > threshold)
+            count = count + 1
+
+        return vmax, vmin, vsum, tmax, dur, count
+
     def readVariablesAtNode(self, node):
 
         # node is the desired node from which to extract results for
@@ -375,7 +920,7 @@ class ppSELAFIN:
         pos_prior_to_var_reading = self.f.tell()
 
         # reads data for all variables in the *.slf file at desired time t_des
-        self.tempAtNode = np.zeros((numTimes, self.NBV1))
+        self.tempAtNode = np.zeros((numTimes, self.NBV1), dtype=self.getValuesDtype())
 
         # it reads the time again, but this it is not used
         time2 = []
@@ -406,11 +951,359 @@ class ppSELAFIN:
         # need to re-set in case another variable needs to be read!
         self.f.seek(pos_prior_to_var_reading)
 
+    def readVariablesAtNodes(self, nodes):
+        # reads all variables, for all times, at each node in the array nodes
+        # in a single sequential sweep of the file; results are stored as a
+        # [node, time, variable] array
+        nodes = checkNodes(nodes, self.NPOIN, self.slf_file)
+
+        if (len(self.frame_offsets) == 0):
+            self.readTimes()
+        numTimes = len(self.frame_offsets)
+
+        pos_prior_to_var_reading = self.f.tell()
+
+        self.tempAtNodes = np.zeros((len(nodes), numTimes, self.NBV1),
+                                    dtype=self.getValuesDtype())
+
+        rec_size = 4 + self.float_size * self.NPOIN + 4
+        dtype = '>' + self.float_type
+
+        # nodes are visited in increasing order, so that the file is only
+        # ever read forward; order holds their place in the output array
+        order = np.argsort(nodes, kind='stable')
+        sorted_nodes = nodes[order]
+
+        # when many nodes are requested it is cheaper to read each frame as a
+        # block and gather from it, than to seek to every node separately
+        gather = (len(nodes) * 1024 >= self.NPOIN)
+
+        for t in range(numTimes):
+            var_start = self.frame_offsets[t] + 4 + self.float_size + 4
+            f = self.getFrameFile(t)
+            f.seek(var_start)
+
+            if gather:
+                buf = f.read(self.NBV1 * rec_size)
+                for i in range(self.NBV1):
+                    values = np.frombuffer(buf, dtype=dtype, count=self.NPOIN,
+                                           offset=i * rec_size + 4)
+                    self.tempAtNodes[:, t, i] = values[nodes]
+            else:
+                for i in range(self.NBV1):
+                    rec_start = var_start + i * rec_size + 4
+                    for k in range(len(sorted_nodes)):
+                        f.seek(rec_start + sorted_nodes[k] * self.float_size)
+                        self.tempAtNodes[order[k], t, i] = unpack(dtype,
+                                                                  f.read(self.float_size))[0]
+
+        # need to re-set in case another variable needs to be read!
+        self.f.seek(pos_prior_to_var_reading)
+
+    def mapVariables(self):
+        # maps the data section of the *.slf file with np.memmap, and returns
+        # a read only [time, variable, node] view of it; nothing is read
+        # until the view is indexed, and then only the pages touched are read
+        rec_dtype = np.dtype([('m0', '>i4'),
+                              ('v', '>' + self.float_type, (self.NPOIN,)),
+                              ('m1', '>i4')])
+        frame_dtype = np.dtype([('m0', '>i4'),
+                                ('time', '>' + self.float_type),
+                                ('m1', '>i4'),
+                                ('vars', rec_dtype, (self.NBV1,))])
+
+        # only complete frames are mapped
+        pos_prior_to_mapping = self.f.tell()
+        self.f.seek(0, 2)
+        file_size = self.f.tell()
+        self.f.seek(pos_prior_to_mapping)
+        numTimes = (file_size - self.data_start) // frame_dtype.itemsize
+
+        if (numTimes < 1):
+            self.vmap = np.zeros((0, self.NBV1, self.NPOIN), dtype='>' + self.float_type)
+            return self.vmap
+
+        # buffers (and io.BytesIO objects) are viewed in place
+        if self.isBuffer():
+            frames = np.frombuffer(self.slf_file, dtype=frame_dtype, count=numTimes,
+                                   offset=self.data_start)
+        elif hasattr(self.f, 'getbuffer'):
+            frames = np.frombuffer(self.f.getbuffer(), dtype=frame_dtype, count=numTimes,
+                                   offset=self.data_start)
+        else:
+            frames = np.memmap(self.slf_file, dtype=frame_dtype, mode='r',
+                               offset=self.data_start, shape=(numTimes,))
+
+        self.vmap = frames['vars']['v']
+        return self.vmap
+
+    def compareMesh(self, other, tol=1.0E-6):
+        # returns True if the ppSELAFIN object other has the same mesh, i.e.,
+        # the same connectivity, and coordinates that differ by at most tol
+        if (self.NPOIN != other.NPOIN or self.NELEM != other.NELEM or
+                self.NDP != other.NDP or self.NPLAN != other.NPLAN):
+            return False
+        if not np.array_equal(self.IKLE, other.IKLE):
+            return False
+        if (self.NPOIN == 0):
+            return True
+        return (np.max(np.abs(self.x - other.x)) <= tol and
+                np.max(np.abs(self.y - other.y)) <= tol)
+
+    def getIndexFile(self):
+        # the sidecar index sits next to the *.slf file (run.slf -> run.slfidx)
+        return os.path.splitext(self.slf_file)[0] + '.slfidx'
+
+    def writeIndex(self):
+        # streams every frame once to compute the min, max and mean of each
+        # variable, and writes them to the sidecar index together with the
+        # header summary, the frame times and the frame offsets; the index
+        # is tied to the size and modification time of the *.slf file
+        if not self.isPath():
+            raise ValueError('Only files given by name can be indexed')
+
+        if (len(self.frame_offsets) == 0):
+            self.readTimes()
+
+        self.varStats = np.zeros((len(self.frame_offsets), self.NBV1, 3))
+        for t, (time, frame) in enumerate(self.iterFrames()):
+            self.varStats[t, :, 0] = np.min(frame, axis=1)
+            self.varStats[t, :, 1] = np.max(frame, axis=1)
+            self.varStats[t, :, 2] = np.mean(frame, axis=1)
+
+        st = os.stat(self.slf_file)
+
+        # np.savez is given an open file, so that it does not add .npz
+        with open(self.getIndexFile(), 'wb') as fidx:
+            np.savez(fidx,
+                     version=1,
+                     file_size=st.st_size,
+                     file_mtime=st.st_mtime,
+                     title=self.title,
+                     precision=self.precision,
+                     float_size=self.float_size,
+                     vnames=np.array(self.vnames),
+                     vunits=np.array(self.vunits),
+                     NELEM=self.NELEM,
+                     NPOIN=self.NPOIN,
+                     NPLAN=self.NPLAN,
+                     NBV1=self.NBV1,
+                     DATE=np.array(self.DATE),
+                     data_start=self.data_start,
+                     times=np.array(self.time, dtype=np.float64),
+                     frame_offsets=np.array(self.frame_offsets, dtype=np.int64),
+                     var_stats=self.varStats)
+
+    def readIndex(self):
+        # loads the frame times, frame offsets and variable statistics from
+        # the sidecar index, if there is one that matches the *.slf file;
+        # returns True if the index was used, and False otherwise (in which
+        # case readTimes() has to be called as usual)
+        if not self.isPath():
+            return False
+
+        idx_file = self.getIndexFile()
+        if not os.path.isfile(idx_file):
+            return False
+
+        st = os.stat(self.slf_file)
+
+        try:
+            with np.load(idx_file) as idx:
+                if (int(idx['version']) != 1 or
+                        int(idx['file_size']) != st.st_size or
+                        float(idx['file_mtime']) != st.st_mtime or
+                        int(idx['NPOIN']) != self.NPOIN or
+                        int(idx['NBV1']) != self.NBV1 or
+                        int(idx['float_size']) != self.float_size or
+                        int(idx['data_start']) != self.data_start):
+                    return False
+
+                self.time = idx['times'].tolist()
+                self.frame_offsets = idx['frame_offsets'].tolist()
+                self.varStats = idx['var_stats']
+        except Exception:
+            return False
+
+        return True
+
+    def writeNodeMajor(self, ts_file, mem_limit=512 * 1024 * 1024, min_chunk=256):
+        # streams the *.slf file, and writes a node major (time series
+        # optimized) companion file ts_file, read with class ppSELAFINts;
+        # the time steps are stored in chunks of chunk frames, each chunk
+        # as a [node, time, variable] block, so that the time series of a
+        # node is one contiguous read per chunk; chunk is as many frames as
+        # fit in mem_limit bytes, but at least min_chunk (or all the time
+        # steps), so that large meshes do not end up with one or two frames
+        # per chunk
+        if (len(self.frame_offsets) == 0):
+            self.readTimes()
+        numTimes = len(self.frame_offsets)
+
+        frame_bytes = self.NBV1 * self.NPOIN * self.float_size
+        chunk = int(max(1, min(numTimes, max(min_chunk, mem_limit // max(1, frame_bytes)))))
+
+        # when chunk frames do not fit in mem_limit, each chunk is written
+        # in blocks of nodes (the [node, time, variable] layout makes each
+        # block of nodes a contiguous part of the chunk); the values of a
+        # block are read as one slice of each record of the frames
+        node_block = int(max(1, min(self.NPOIN,
+                                    mem_limit // max(1, chunk * self.NBV1 * self.float_size))))
+
+        fout = open(ts_file, 'wb')
+        fout.write(pack('>8s', 'PPSLFTS '.encode()))
+        fout.write(pack('>7i', 1, self.NPOIN, self.NBV1, numTimes,
+                        self.NPLAN, self.float_size, chunk))
+        fout.write(pack('>72s', '{:<72}'.format(self.title)[0:72].encode()))
+        for i in range(self.NBV1):
+            fout.write(pack('>16s', '{:<16}'.format(self.vnames[i]).encode()))
+            fout.write(pack('>16s', '{:<16}'.format(self.vunits[i]).encode()))
+        fout.write(pack('>6i', *self.DATE))
+        fout.write(np.asarray(self.x, dtype='>f8').tobytes())
+        fout.write(np.asarray(self.y, dtype='>f8').tobytes())
+        fout.write(np.asarray(self.time, dtype='>f8').tobytes())
+
+        if (node_block == self.NPOIN):
+            # whole frames fit; a single pass through the *.slf file
+            buf = np.zeros((self.NPOIN, chunk, self.NBV1), dtype='>' + self.float_type)
+            k = 0
+            for time, frame in self.iterFrames():
+                buf[:, k, :] = frame.T
+                k = k + 1
+                if (k == chunk):
+                    fout.write(buf.tobytes())
+                    k = 0
+            if (k > 0):
+                fout.write(buf[:, 0:k, :].tobytes())
+        else:
+            pos_prior_to_var_reading = self.f.tell()
+            rec_size = 4 + self.float_size * self.NPOIN + 4
+            dtype = '>' + self.float_type
+            buf = np.zeros((node_block, chunk, self.NBV1), dtype=dtype)
+            for t0 in range(0, numTimes, chunk):
+                nt = min(chunk, numTimes - t0)
+                for n0 in range(0, self.NPOIN, node_block):
+                    nb = min(node_block, self.NPOIN - n0)
+                    for k in range(nt):
+                        # the frame is in the file given by getFrameFile()
+                        # (e.g., a later segment of a ppSELAFINset); frames
+                        # that are not stored as records (compressed
+                        # archives) are decoded whole, and sliced
+                        f = self.getFrameFile(t0 + k)
+                        if not self.raw_frames:
+                            frame = self.readFrame(f, t0 + k, list(range(self.NBV1)))
+                            buf[0:nb, k, :] = frame[:, n0:n0 + nb].T
+                            continue
+                        var_start = self.frame_offsets[t0 + k] + 4 + self.float_size + 4
+                        for v in range(self.NBV1):
+                            f.seek(var_start + v * rec_size + 4 + n0 * self.float_size)
+                            buf[0:nb, k, v] = np.frombuffer(f.read(nb * self.float_size),
+                                                            dtype=dtype)
+                    fout.write(buf[0:nb, 0:nt, :].tobytes())
+            self.f.seek(pos_prior_to_var_reading)
+
+        fout.close()
+
+    def getHeaderBytes(self):
+        # the header records of the file, as they are stored in it
+        pos_prior_to_reading = self.f.tell()
+        self.f.seek(0)
+        header = self.f.read(self.data_start)
+        self.f.seek(pos_prior_to_reading)
+        return header
+
+    def writeArchive(self, z_file, codec='zlib', tolerance=0.0, chunk=None, level=6):
+        # streams the *.slf file once, and writes the compressed archive
+        # z_file, read with class ppSELAFINz; frames are grouped in chunks of
+        # chunk frames (default is about 4 MB of values per variable), and
+        # each variable of each chunk is compressed on its own with codec
+        # ('zlib', 'lzma' or 'none'), so that readers only decompress what
+        # they read; with tolerance > 0 the values are quantized to steps of
+        # 2*tolerance before compression (lossy; max error is tolerance)
+        if (codec not in ('zlib', 'lzma', 'none')):
+            raise ValueError('Unknown codec ' + str(codec))
+        if (codec == 'lzma' and lzma is None):
+            raise ValueError('lzma is not available in this version of python')
+
+        if (len(self.frame_offsets) == 0):
+            self.readTimes()
+        numTimes = len(self.time)
+
+        if (chunk is None):
+            chunk = (4 * 1024 * 1024) // max(1, self.NPOIN * self.float_size)
+        chunk = int(max(1, min(numTimes, chunk)))
+        numChunks = (numTimes + chunk - 1) // chunk
+
+        header = self.getHeaderBytes()
+
+        # the marker of the time record of each frame is kept, so that the
+        # frames are restored byte for byte (older double precision files
+        # have a time marker of 4, see validateFrames())
+        # (the frame is in the file given by getFrameFile(), e.g., a later
+        # segment of a ppSELAFINset; an archive keeps the markers itself)
+        if not self.raw_frames:
+            time_markers = list(self.time_markers)
+        else:
+            time_markers = []
+            for t in range(numTimes):
+                f = self.getFrameFile(t)
+                pos_prior_to_reading = f.tell()
+                f.seek(self.frame_offsets[t])
+                time_markers.append(unpack('>i', f.read(4))[0])
+                f.seek(pos_prior_to_reading)
+
+        fout = open(z_file, 'wb')
+        fout.write(pack('>8s', 'PPSLFZ  '.encode()))
+        fout.write(pack('>4i', 2, chunk, numTimes, len(header)))
+        fout.write(pack('>8s', '{:<8}'.format(codec).encode()))
+        fout.write(pack('>d', tolerance))
+        fout.write(header)
+        fout.write(np.asarray(self.time, dtype='>f8').tobytes())
+        fout.write(np.asarray(time_markers, dtype='>i4').tobytes())
+
+        # the chunk index (offset, size, kind, base and step of each chunk
+        # of each variable) is written once the chunks are
+        index_start = fout.tell()
+        fout.write(b'\0' * (numChunks * self.NBV1 * 36))
+        index = []
+
+        buf = np.zeros((chunk, self.NBV1, self.NPOIN), dtype=self.float_type)
+        k = 0
+        t = 0
+        for time, frame in self.iterFrames():
+            buf[k] = frame
+            k = k + 1
+            t = t + 1
+            if (k == chunk or t == numTimes):
+                for i in range(self.NBV1):
+                    kind, base, step, data = compressChunk(buf[0:k, i, :], self.float_type,
+                                                           codec, tolerance, level)
+                    index.append(pack('>qqidd', fout.tell(), len(data), kind, base, step))
+                    fout.write(data)
+                k = 0
+
+        fout.seek(index_start)
+        fout.write(b''.join(index))
+        fout.close()
+
+    def mapPlanes(self):
+        # same as mapVariables(), but the view of a 3d file is shaped
+        # [time, variable, plane, node2d]; [t, v] is a [plane, node2d] view
+        # of one frame, and [:, v, p] is one plane across all frames
+        vmap = self.mapVariables()
+        return vmap.reshape(vmap.shape[0], self.NBV1, self.NPLAN, self.getNPOIN2())
+
         # get methods start here
 
     def getPrecision(self):
         return self.float_type, self.float_size
 
+    def getValuesDtype(self):
+        # dtype of the arrays of values read from the file
+        if self.native:
+            return np.dtype(self.float_type)
+        return np.dtype(np.float64)
+
     def getNPOIN(self):
         return self.NPOIN
 
@@ -420,15 +1313,43 @@ class ppSELAFIN:
     def getTimes(self):
         return self.time
 
+    def getFrameOffsets(self):
+        return self.frame_offsets
+
+    def getStartDate(self):
+        # DATE as a python datetime; model time 0 is at this date
+        return datetime(*[int(d) for d in self.DATE])
+
+    def getTimeFromDate(self, date):
+        # model time (in seconds) of the python datetime date
+        return (date - self.getStartDate()).total_seconds()
+
     def getVarNames(self):
         return self.vnames
 
+    def getVarIndex(self, var):
+        # var is either the index of a variable, or its name (case and
+        # padding are ignored)
+        if isinstance(var, str):
+            for i in range(self.NBV1):
+                if (self.vnames[i].strip().upper() == var.strip().upper()):
+                    return i
+            raise ValueError('Variable ' + var + ' not found in ' + str(self.slf_file))
+
+        if (var < 0 or var >= self.NBV1):
+            raise ValueError('Variable index ' + str(var) + ' out of range')
+        return int(var)
+
     def getVarUnits(self):
         return self.vunits
 
     def getNPLAN(self):
         return self.NPLAN
 
+    def getNPOIN2(self):
+        # number of nodes in each plane (equal to NPOIN for 2d files)
+        return self.NPOIN // max(1, self.NPLAN)
+
     def getIKLE(self):
         return self.IKLE
 
@@ -441,9 +1362,24 @@ class ppSELAFIN:
     def getVarValues(self):
         return self.temp
 
+    def getVarValuesMap(self):
+        return self.vmap
+
+    def getPlaneValues(self):
+        return self.tempPlanes
+
+    def getPlaneSeriesValues(self):
+        return self.tempPlaneSeries
+
     def getVarValuesAtNode(self):
         return self.tempAtNode
 
+    def getVarValuesAtNodes(self):
+        return self.tempAtNodes
+
+    def getVarStats(self):
+        return self.varStats
+
     def getIPOBO(self):
         return self.IPOBO
 
@@ -465,6 +1401,17 @@ class ppSELAFIN:
         if (ftype == 'f' and fsize == 4):
             self.precision = 'SELAFIN '
 
+    def setNPLAN(self, NPLAN):
+        # for 3d files, NPOIN and IKLE passed to setMesh() are those of the
+        # 3d mesh (NPOIN = NPLAN * number of 2d nodes, NDP = 6 for prisms)
+        self.NPLAN = NPLAN
+
+    def setNativePrecision(self, native):
+        # opt in (native=True) to keep values read in the file's precision;
+        # call before readHeader(); note that readVariables() then re-uses
+        # the array returned by getVarValues(), so copy it to keep it
+        self.native = native
+
     def setTitle(self, title):
         self.title = title
 
@@ -490,5 +1437,588 @@ class ppSELAFIN:
         self.x = x
         self.y = y
 
+    def close(self):
+        # open file objects given to the constructor are left open
+        if self.own_file:
+            self.f.close()
+
+
+#
+class ppSELAFINset(ppSELAFIN):
+    # reads several *.slf files on the same mesh (e.g., the restart segments
+    # run_001.slf, run_002.slf, ... of one simulation) as if they were one
+    # file with a continuous time axis; slf_files is the list of files in
+    # time order; where the times of two segments overlap, the frames of
+    # the later segment are kept (frames of the earlier one at or after the
+    # first time of the later one are dropped)
+
+    # object's properties
+    def __init__(self, slf_files, tol=1.0E-6):
+        ppSELAFIN.__init__(self, slf_files[0])
+
+        self.slf_files = list(slf_files)
+
+        # times closer than tol are taken to be the same
+        self.tol = tol
+
+        # one ppSELAFIN object per file (filled by readHeader)
+        self.segments = []
+
+        # segment of each frame, and its index within that segment (filled
+        # by readTimes); frame_offsets are offsets within the segment's file
+        self.frame_seg = []
+        self.frame_local = []
+
+        # the segment files are shared with the reader thread of
+        # iterFrames(), so reads through them are serialized
+        self.lock = threading.Lock()
+
+    # methods start here
+    def readHeader(self):
+        self.segments = []
+        for slf_file in self.slf_files:
+            seg = ppSELAFIN(slf_file)
+            seg.setNativePrecision(self.native)
+            seg.readHeader()
+            self.segments.append(seg)
+
+        first = self.segments[0]
+        for seg in self.segments[1:]:
+            if not first.compareMesh(seg):
+                raise ValueError(str(seg.slf_file) + ' does not have the same mesh as ' +
+                                 str(first.slf_file))
+            if (seg.float_size != first.float_size or
+                    [v.strip() for v in seg.vnames] != [v.strip() for v in first.vnames]):
+                raise ValueError(str(seg.slf_file) + ' does not have the same variables ' +
+                                 'or precision as ' + str(first.slf_file))
+
+        # the header is that of the first segment
+        for attr in ('f', 'title', 'precision', 'float_type', 'float_size', 'NBV1',
+                     'NBV2', 'vars', 'vnames', 'vunits', 'IPARAM', 'NPLAN', 'DATE',
+                     'NELEM', 'NPOIN', 'NDP', 'IKLE', 'IPOBO', 'x', 'y', 'data_start'):
+            setattr(self, attr, getattr(first, attr))
+
+    def readTimes(self):
+        self.time = []
+        self.frame_offsets = []
+        self.frame_seg = []
+        self.frame_local = []
+
+        for s in range(len(self.segments)):
+            seg = self.segments[s]
+            seg.readTimes()
+            if (len(seg.time) == 0):
+                continue
+
+            # frames kept so far that this segment supersedes
+            keep = len(self.time)
+            while (keep > 0 and self.time[keep - 1] >= seg.time[0] - self.tol):
+                keep = keep - 1
+            del self.time[keep:]
+            del self.frame_offsets[keep:]
+            del self.frame_seg[keep:]
+            del self.frame_local[keep:]
+
+            self.time.extend(seg.time)
+            self.frame_offsets.extend(seg.frame_offsets)
+            self.frame_seg.extend([s] * len(seg.time))
+            self.frame_local.extend(range(len(seg.time)))
+
+    def getFrameFile(self, t_des):
+        return self.segments[self.frame_seg[t_des]].f
+
+    def readFrame(self, f, t_des, var_idx, out=None):
+        # f is ignored; the frame is read from the file of its segment
+        seg = self.segments[self.frame_seg[t_des]]
+        with self.lock:
+            return seg.readFrame(seg.f, self.frame_local[t_des], var_idx, out)
+
+    def readVariablesAtNode(self, node):
+        # ppSELAFIN.readVariablesAtNode() scans a single file, so the set
+        # uses readVariablesAtNodes() instead
+        self.readVariablesAtNodes([node])
+        self.tempAtNode = self.tempAtNodes[0]
+
+    def mapVariables(self):
+        raise ValueError('mapVariables() is not supported for a set of *.slf files')
+
+    def writeIndex(self):
+        raise ValueError('writeIndex() is not supported for a set of *.slf files; ' +
+                         'index each file separately')
+
+    def readIndex(self):
+        # frame times are always read from the segments
+        return False
+
+    def validateFrames(self):
+        raise ValueError('validateFrames() is not supported for a set of *.slf files; ' +
+                         'validate each file separately')
+
+    def repairFile(self, out_file=None, block_size=16 * 1024 * 1024):
+        raise ValueError('repairFile() is not supported for a set of *.slf files; ' +
+                         'repair each file separately')
+
+    def getSegments(self):
+        return self.segments
+
+    def getFrameSegments(self):
+        return self.frame_seg
+
+    def close(self):
+        for seg in self.segments:
+            seg.close()
+
+
+#
+class ppSELAFINz(ppSELAFIN):
+    # reader for the compressed archives (*.slfz) written by
+    # ppSELAFIN.writeArchive(); it has the same methods as ppSELAFIN, and
+    # only decompresses the chunks of the frames and variables it reads
+
+    # object's properties
+    def __init__(self, z_file):
+        ppSELAFIN.__init__(self, z_file)
+
+        # frames are compressed, so they can not be copied byte for byte
+        self.raw_frames = False
+
+        self.codec = 'zlib'
+        self.tolerance = 0.0
+
+        # number of frames in each chunk
+        self.chunk = 1
+
+        # header records of the original *.slf file
+        self.header = b''
+
+        # [chunk, variable] array of the offset, size, kind, base and step
+        # of each compressed chunk (filled by readHeader)
+        self.index = np.zeros((0, 0))
+
+        # times of the frames (copied to self.time by readTimes), and the
+        # marker of the time record of each frame in the original file
+        self.ztimes = []
+        self.time_markers = []
+
+        # chunks decompressed last, by (chunk, variable); the cache is
+        # shared with the reader thread of iterFrames()
+        self.cache = {}
+        self.lock = threading.Lock()
+
+    # methods start here
+    def readHeader(self):
+        self.f = self.openFile('rb')
+
+        magic = unpack('>8s', self.f.read(8))[0].decode()
+        if (magic != 'PPSLFZ  '):
+            raise ValueError(str(self.slf_file) + ' is not a compressed archive')
+
+        version, self.chunk, numTimes, header_size = unpack('>4i', self.f.read(4 * 4))
+        self.codec = unpack('>8s', self.f.read(8))[0].decode().strip()
+        self.tolerance = unpack('>d', self.f.read(8))[0]
+        if (self.codec == 'lzma' and lzma is None):
+            raise ValueError('lzma is not available in this version of python')
+
+        header_start = self.f.tell()
+        self.readHeaderRecords()
+        self.f.seek(header_start)
+        self.header = self.f.read(header_size)
+
+        self.ztimes = np.frombuffer(self.f.read(8 * numTimes), dtype='>f8').tolist()
+
+        # archives of version 1 do not keep the time record markers
+        if (version >= 2):
+            self.time_markers = np.frombuffer(self.f.read(4 * numTimes), dtype='>i4').tolist()
+        else:
+            self.time_markers = [self.float_size] * numTimes
+
+        numChunks = (numTimes + self.chunk - 1) // self.chunk
+        index_dtype = np.dtype([('offset', '>i8'), ('nbytes', '>i8'), ('kind', '>i4'),
+                                ('base', '>f8'), ('step', '>f8')])
+        self.index = np.frombuffer(self.f.read(numChunks * self.NBV1 * index_dtype.itemsize),
+                                   dtype=index_dtype).reshape(numChunks, self.NBV1)
+
+        self.data_start = self.f.tell()
+
+    def readTimes(self):
+        # the frames have no records of their own in an archive; the offset
+        # of each frame is that of its chunk (of the first variable)
+        self.time = list(self.ztimes)
+        self.frame_offsets = [int(self.index[t // self.chunk, 0]['offset'])
+                              for t in range(len(self.time))]
+
+    def readChunk(self, f, c, v):
+        # decompresses variable v of chunk c, read from the open file f, as a
+        # [time, node] array
+        with self.lock:
+            if (c, v) in self.cache:
+                return self.cache[(c, v)]
+
+        entry = self.index[c, v]
+        f.seek(int(entry['offset']))
+        data = f.read(int(entry['nbytes']))
+
+        numTimes = min(self.chunk, len(self.ztimes) - c * self.chunk)
+        values = decompressChunk(data, self.float_type, self.codec, int(entry['kind']),
+                                 float(entry['base']), float(entry['step']),
+                                 (numTimes, self.NPOIN)).astype(self.getValuesDtype())
+
+        # only the variables of one chunk are kept
+        with self.lock:
+            for key in list(self.cache.keys()):
+                if (key[0] != c):
+                    del self.cache[key]
+            self.cache[(c, v)] = values
+
+        return values
+
+    def readFrame(self, f, t_des, var_idx, out=None):
+        c = t_des // self.chunk
+
+        if (out is None):
+            frame = np.zeros((len(var_idx), self.NPOIN), dtype=self.getValuesDtype())
+        else:
+            frame = out
+
+        for i in range(len(var_idx)):
+            frame[i, :] = self.readChunk(f, c, var_idx[i])[t_des - c * self.chunk]
+
+        return frame
+
+    def readVariablesAtNode(self, node):
+        self.readVariablesAtNodes([node])
+        self.tempAtNode = self.tempAtNodes[0]
+
+    def readVariablesAtNodes(self, nodes):
+        # same as ppSELAFIN.readVariablesAtNodes(); every chunk is
+        # decompressed once
+        nodes = checkNodes(nodes, self.NPOIN, self.slf_file)
+
+        if (len(self.frame_offsets) == 0):
+            self.readTimes()
+
+        self.tempAtNodes = np.zeros((len(nodes), len(self.time), self.NBV1),
+                                    dtype=self.getValuesDtype())
+
+        for c in range(self.index.shape[0]):
+            t0 = c * self.chunk
+            for i in range(self.NBV1):
+                values = self.readChunk(self.f, c, i)
+                self.tempAtNodes[:, t0:t0 + values.shape[0], i] = values[:, nodes].T
+
+    def readPlaneSeries(self, plane, var):
+        if (len(self.frame_offsets) == 0):
+            self.readTimes()
+
+        v = self.getVarIndex(var)
+        NPOIN2 = self.getNPOIN2()
+
+        self.tempPlaneSeries = np.zeros((len(self.time), NPOIN2), dtype=self.getValuesDtype())
+        for c in range(self.index.shape[0]):
+            t0 = c * self.chunk
+            values = self.readChunk(self.f, c, v)
+            self.tempPlaneSeries[t0:t0 + values.shape[0], :] = \
+                values[:, plane * NPOIN2:(plane + 1) * NPOIN2]
+
+    def getHeaderBytes(self):
+        return self.header
+
+    def writeSELAFIN(self, slf_file):
+        # restores the original *.slf file: the header records are written
+        # as they were stored, followed by the decompressed frames with the
+        # original record markers; for an archive written with tolerance 0
+        # the file is the same byte for byte as the original
+        if (len(self.frame_offsets) == 0):
+            self.readTimes()
+
+        fout = open(slf_file, 'wb')
+        fout.write(self.header)
+
+        marker = pack('>i', self.float_size * self.NPOIN)
+        for t, (time, frame) in enumerate(self.iterFrames()):
+            data = np.asarray(frame, dtype='>' + self.float_type)
+            record = [pack('>i', self.time_markers[t]),
+                      pack('>' + self.float_type, time),
+                      pack('>i', self.time_markers[t])]
+            for j in range(self.NBV1):
+                record.append(marker)
+                record.append(data[j, :].tobytes())
+                record.append(marker)
+            fout.write(b''.join(record))
+
+        fout.close()
+
+    def mapVariables(self):
+        raise ValueError('mapVariables() is not supported for compressed archives')
+
+    def writeIndex(self):
+        raise ValueError('writeIndex() is not supported for compressed archives')
+
+    def readIndex(self):
+        # the archive has its own index
+        return False
+
+    def validateFrames(self):
+        raise ValueError('validateFrames() is not supported for compressed archives')
+
+    def repairFile(self, out_file=None, block_size=16 * 1024 * 1024):
+        raise ValueError('repairFile() is not supported for compressed archives')
+
+    def getCodec(self):
+        return self.codec
+
+    def getTolerance(self):
+        return self.tolerance
+
+
+#
+def compressChunk(values, float_type, codec, tolerance=0.0, level=6):
+    # compresses the [time, node] array values (one variable of one chunk of
+    # an archive); returns the kind of values stored (0 for floats of type
+    # float_type, or the size in bytes of the quantized integers), the base
+    # and step of the quantization, and the compressed bytes
+    kind = 0
+    base = 0.0
+    step = 0.0
+    a = np.ascontiguousarray(values, dtype='>' + float_type)
+
+    # values are quantized as base + q*step, with q an unsigned integer of
+    # the smallest size that fits; chunks with nan or inf are kept as floats
+    if (tolerance > 0.0 and a.size > 0 and np.all(np.isfinite(a))):
+        base = float(np.min(a))
+        step = 2.0 * tolerance
+        q = np.round((a.astype(np.float64) - base) / step)
+        for size in (1, 2, 4):
+            if (np.max(q) < 2 ** (8 * size)):
+                kind = size
+                a = q.astype('>u' + str(size))
+                break
+        if (kind == 0):
+            base = 0.0
+            step = 0.0
+
+    # the bytes of the values are grouped by position (byte shuffle), which
+    # compresses much better than the interleaved bytes of the values
+    raw = a.view(np.uint8).reshape(-1, a.dtype.itemsize).T.tobytes()
+
+    if (codec == 'zlib'):
+        data = zlib.compress(raw, level)
+    elif (codec == 'lzma'):
+        data = lzma.compress(raw, preset=level)
+    else:
+        data = raw
+
+    return kind, base, step, data
+
+
+#
+def decompressChunk(data, float_type, codec, kind, base, step, shape):
+    # reverses compressChunk(), and returns the values as an array of the
+    # given [time, node] shape
+    if (codec == 'zlib'):
+        raw = zlib.decompress(data)
+    elif (codec == 'lzma'):
+        raw = lzma.decompress(data)
+    else:
+        raw = data
+
+    if (kind == 0):
+        dtype = np.dtype('>' + float_type)
+    else:
+        dtype = np.dtype('>u' + str(kind))
+
+    a = np.frombuffer(raw, dtype=np.uint8).reshape(dtype.itemsize, -1).T
+    a = np.ascontiguousarray(a).view(dtype).reshape(shape)
+
+    if (kind > 0):
+        return base + a * step
+    return a
+
+
+#
+def checkNodes(nodes, NPOIN, name):
+    # returns nodes (node indices, starting at 0) as a flat int64 array, and
+    # raises ValueError naming the first node that is not in 0 ... NPOIN-1;
+    # negative indices would otherwise wrap around silently
+    nodes = np.asarray(nodes, dtype=np.int64).ravel()
+    bad = np.flatnonzero((nodes < 0) | (nodes >= NPOIN))
+    if (len(bad) > 0):
+        raise ValueError('Node ' + str(nodes[bad[0]]) + ' out of range (0 to ' +
+                         str(NPOIN - 1) + ') in ' + str(name))
+    return nodes
+
+
+#
+def openSELAFIN(slf_file):
+    # returns the reader for slf_file: a ppSELAFINz for a compressed archive
+    # (*.slfz), a ppSELAFINset for a list of *.slf files (or a comma
+    # separated string of them), and a ppSELAFIN otherwise (also for buffers
+    # and open file objects); readHeader() is called as usual
+    if isinstance(slf_file, (list, tuple)):
+        if (len(slf_file) > 1):
+            return ppSELAFINset(slf_file)
+        slf_file = slf_file[0]
+    if not isinstance(slf_file, str):
+        return ppSELAFIN(slf_file)
+
+    # a string is only split when it is not itself a file, and all of its
+    # parts are (a file name may contain a comma)
+    if not os.path.isfile(slf_file) and (',' in slf_file):
+        parts = slf_file.split(',')
+        if all([os.path.isfile(part) for part in parts]):
+            return ppSELAFINset(parts)
+    if slf_file.endswith('.slfz'):
+        return ppSELAFINz(slf_file)
+    return ppSELAFIN(slf_file)
+
+
+#
+def mergeEnvelopes(parts):
+    # merges the results of ppSELAFIN.computeEnvelope() for consecutive
+    # frame ranges (in time order) into the envelope of the whole range
+    vmax, vmin, vsum, tmax, dur, count = parts[0]
+    for p in parts[1:]:
+        # ties keep the earlier time of max
+        above = p[0] > vmax
+        vmax = np.where(above, p[0], vmax)
+        tmax = np.where(above, p[3], tmax)
+        vmin = np.minimum(vmin, p[1])
+        vsum = vsum + p[2]
+        dur = dur + p[4]
+        count = count + p[5]
+    return vmax, vmin, vsum, tmax, dur, count
+
+
+#
+class ppSELAFINts:
+    # reader for the node major companion files written by
+    # ppSELAFIN.writeNodeMajor(); the data of chunk c (time steps
+    # c*chunk ... c*chunk+chunk-1) is a [node, time, variable] block
+
+    # object's properties
+    def __init__(self, ts_file):
+        self.ts_file = ts_file
+
+        self.title = ''
+        self.float_type = 'f'
+        self.float_size = 4
+
+        self.vnames = []
+        self.vunits = []
+
+        self.NPOIN = 0
+        self.NBV1 = 0
+        self.NPLAN = 1
+        self.chunk = 1
+
+        self.DATE = [1997, 8, 29, 2, 15, 0]
+
+        self.x = np.zeros(self.NPOIN)
+        self.y = np.zeros(self.NPOIN)
+
+        self.time = []
+
+        # byte offset of the first chunk
+        self.data_start = 0
+
+        # nodes closer than this many bytes on disk are read together
+        self.max_gap = 64 * 1024
+
+        # [node, time, variable] array filled by readVariablesAtNodes
+        self.tempAtNodes = np.zeros((0, 0, 0))
+
+    # methods start here
+    def readHeader(self):
+        self.f = open(self.ts_file, 'rb')
+
+        magic = unpack('>8s', self.f.read(8))[0].decode()
+        if (magic != 'PPSLFTS '):
+            raise ValueError(str(self.ts_file) + ' is not a node major companion file')
+
+        version, self.NPOIN, self.NBV1, numTimes, self.NPLAN, self.float_size, \
+            self.chunk = unpack('>7i', self.f.read(7 * 4))
+        if (self.float_size == 8):
+            self.float_type = 'd'
+
+        self.title = unpack('>72s', self.f.read(72))[0].decode()
+        for i in range(self.NBV1):
+            self.vnames.append(unpack('>16s', self.f.read(16))[0].decode())
+            self.vunits.append(unpack('>16s', self.f.read(16))[0].decode())
+        self.DATE = unpack('>6i', self.f.read(6 * 4))
+
+        self.x = np.frombuffer(self.f.read(8 * self.NPOIN), dtype='>f8').astype(np.float64)
+        self.y = np.frombuffer(self.f.read(8 * self.NPOIN), dtype='>f8').astype(np.float64)
+        self.time = np.frombuffer(self.f.read(8 * numTimes), dtype='>f8').tolist()
+
+        self.data_start = self.f.tell()
+
+    def readVariablesAtNodes(self, nodes):
+        # reads all variables, for all times, at each node in the array
+        # nodes; results are stored as a [node, time, variable] array, as in
+        # ppSELAFIN.readVariablesAtNodes()
+        nodes = checkNodes(nodes, self.NPOIN, self.ts_file)
+        numTimes = len(self.time)
+
+        self.tempAtNodes = np.zeros((len(nodes), numTimes, self.NBV1))
+
+        # the distinct nodes are read in increasing order; nodes that are
+        # next to each other on disk (or close enough that reading the gap
+        # is cheaper than a seek) are read with a single read per chunk;
+        # inverse holds the place of each node in the output array
+        uniq, inverse = np.unique(nodes, return_inverse=True)
+        if (len(uniq) == 0):
+            return
+
+        offset = self.data_start
+        for t0 in range(0, numTimes, self.chunk):
+            nt = min(self.chunk, numTimes - t0)
+            node_bytes = nt * self.NBV1 * self.float_size
+
+            # runs of nodes that are read together
+            gaps = (np.diff(uniq) - 1) * node_bytes
+            breaks = np.flatnonzero(gaps > self.max_gap)
+            first = np.concatenate(([0], breaks + 1))
+            last = np.concatenate((breaks, [len(uniq) - 1]))
+
+            values = np.zeros((len(uniq), nt, self.NBV1))
+            for a, b in zip(first, last):
+                count = uniq[b] - uniq[a] + 1
+                self.f.seek(offset + uniq[a] * node_bytes)
+                run = np.frombuffer(self.f.read(count * node_bytes), dtype='>' + self.float_type)
+                values[a:b + 1] = run.reshape(count, nt, self.NBV1)[uniq[a:b + 1] - uniq[a]]
+            self.tempAtNodes[:, t0:t0 + nt, :] = values[inverse]
+            offset = offset + self.NPOIN * node_bytes
+
+    # get methods start here
+    def getPrecision(self):
+        return self.float_type, self.float_size
+
+    def getNPOIN(self):
+        return self.NPOIN
+
+    def getNPLAN(self):
+        return self.NPLAN
+
+    def getTimes(self):
+        return self.time
+
+    def getVarNames(self):
+        return self.vnames
+
+    def getVarUnits(self):
+        return self.vunits
+
+    def getDATE(self):
+        return self.DATE
+
+    def getMeshX(self):
+        return self.x
+
+    def getMeshY(self):
+        return self.y
+
+    def getVarValuesAtNodes(self):
+        return self.tempAtNodes
+
     def close(self):
         self.f.close()
@@ -3,12 +3,34 @@ pputils functions for writing meshes, re-formatted and optimized for Python3
 Original Author: Pad Prodanovic
 Modularized by: Sebastian Schwindt
 """
+from itertools import chain
+import numpy as np
 
 
-def writeAdcirc(n, e, x, y, z, ikle, name):
+def _write_block(fout, fmt, columns, chunk=100000):
+    """
+    Writes the rows of a table, formatting a whole chunk of rows with a single % operation
+    :param fout: file object opened for writing text
+    :param str fmt: format of one row (e.g. "%d %.3f %.3f %.3f\\n")
+    :param list columns: arrays (all of the same length) holding the columns of the table
+    :param int chunk: number of rows formatted at a time
+    :return: None
+    """
+    columns = [np.asarray(c) for c in columns]
+    nrows = len(columns[0])
+    for start in range(0, nrows, chunk):
+        rows = zip(*[c[start:start + chunk].tolist() for c in columns])
+        values = tuple(chain.from_iterable(rows))
+        fout.write((fmt * (len(values) // len(columns))) % values)
+
+
+def writeAdcirc(n, e, x, y, z, ikle, name, precision=3):
     """
     Write an adcirc grd mesh assuming that the indices in the ikle array are zero-based.
     Recall: Telemac uses one-based ikle arrays.
+    The nodes and elements are formatted in chunks of rows (see _write_block) rather than one line
+    at a time, so that writing large meshes is bound by I/O; scripts that write *.grd files use this
+    function rather than their own loops.
 
     :param n:
     :param e:
@@ -17,8 +39,10 @@ def writeAdcirc(n, e, x, y, z, ikle, name):
     :param z:
     :param ikle:
     :param str name: name of the adcirc output file (must end on ".grd")
+    :param int precision: number of decimals written for the x, y and z of the nodes
     :return: None
     """
+    ikle = np.asarray(ikle)
 
     # write the output file where the name argument is the name of the output adcirc file
     fout = open(name, "w")
@@ -28,16 +52,15 @@ def writeAdcirc(n, e, x, y, z, ikle, name):
     # write the number of elements and number of nodes to the file header
     fout.write(str(e) + " " + str(n) + "\n")
 
-    # write nodes
-    for i in range(n):
-        fout.write(str(i + 1) + " " + str("{:.3f}".format(x[i])) + " " +
-                   str("{:.3f}".format(y[i])) + " " + str("{:.3f}".format(z[i])) + "\n")
+    # write nodes, formatting them in chunks rather than one line at a time
+    coord = "%." + str(precision) + "f"
+    _write_block(fout, "%d " + coord + " " + coord + " " + coord + "\n",
+                 [np.arange(1, n + 1), x[:n], y[:n], z[:n]])
 
     # write the elements
     # the readAdcirc function assigns the ikle starting at zero, so that is why we have to add 1
-    for i in range(e):
-        fout.write(str(i + 1) + " 3 " + str(ikle[i, 0] + 1) + " " + str(ikle[i, 1] + 1) +
-                   " " + str(ikle[i, 2] + 1) + "\n")
+    _write_block(fout, "%d 3 %d %d %d\n",
+                 [np.arange(1, e + 1), ikle[:e, 0] + 1, ikle[:e, 1] + 1, ikle[:e, 2] + 1])
 
     # close the fout file
     fout.close()
@@ -45,7 +68,7 @@ def writeAdcirc(n, e, x, y, z, ikle, name):
     return None
 
 
-def write2dm(n, e, x, y, z, ikle, name):
+def write2dm(n, e, x, y, z, ikle, name, precision=3):
     """
     Write an SMS 2dm mesh assuming that the indices in the ikle array are zero-based.
     Recall: Telemac uses one-based ikle arrays.
@@ -57,8 +80,11 @@ def write2dm(n, e, x, y, z, ikle, name):
     :param z:
     :param ikle:
     :param str name: name of the 2dm output file (must end on ".2dm")
+    :param int precision: number of decimals written for the x, y and z of the nodes
     :return: None
     """
+    ikle = np.asarray(ikle)
+
     # start output file, where the name argument is the name of the output 2dm file
     fout = open(name, "w")
 
@@ -67,14 +93,13 @@ def write2dm(n, e, x, y, z, ikle, name):
 
     # write the elements, where the n,e,x,y,z,ikle are zero-based,
     # so we add 1 to make it 1 based
-    for i in range(e):
-        fout.write("E3T " + str(i + 1) + " " + str(ikle[i, 0] + 1) + " " + str(ikle[i, 1] + 1) +
-                   " " + str(ikle[i, 2] + 1) + " 1" + "\n")
+    _write_block(fout, "E3T %d %d %d %d 1\n",
+                 [np.arange(1, e + 1), ikle[:e, 0] + 1, ikle[:e, 1] + 1, ikle[:e, 2] + 1])
 
     # write nodes
-    for i in range(n):
-        fout.write("ND " + str(i + 1) + " " + str("{:.3f}".format(x[i])) + " " +
-                   str("{:.3f}".format(y[i])) + " " + str("{:.3f}".format(z[i])) + "\n")
+    coord = "%." + str(precision) + "f"
+    _write_block(fout, "ND %d " + coord + " " + coord + " " + coord + "\n",
+                 [np.arange(1, n + 1), x[:n], y[:n], z[:n]])
 
     # close the fout file
     fout.close()
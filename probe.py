@@ -16,6 +16,13 @@
 # Revised: Apr 30, 2016
 # Added ability to probe 3d *.slf files.
 #
+# Revised: Oct 17, 2026
+# Times are taken from the sidecar *.slfidx index when one exists and is
+# up to date (it is created with mkslfidx.py).
+#
+# Revised: Oct 17, 2026
+# The input can also be a compressed archive (*.slfz) written by sel2slfz.py.
+#
 # Uses: Python 2 or 3, Numpy
 #
 # Example: python probe2.py -i input.slf
@@ -48,9 +55,13 @@ print('#################################')
 print("The input file being probed: " + input_file)
 #
 # constructor for pp_SELAFIN class
-slf = ppSELAFIN(input_file)
+slf = openSELAFIN(input_file)
 slf.readHeader()
-slf.readTimes()
+
+# use the sidecar index (see mkslfidx.py) if there is a valid one, as it
+# avoids walking through the file to get the times
+if not slf.readIndex():
+  slf.readTimes()
 
 times = slf.getTimes()
 vnames = slf.getVarNames()
@@ -20,6 +20,9 @@
 # adcirc via adcirc2ren.py, the coordinate shift is written there. These same 
 # coordinates must be used as input here to get the correct adcirc file.
 #
+# Modified: Oct 17, 2026
+# Made it use writeAdcirc() to write the output file
+#
 # Uses: Python 2 or 3, Numpy
 #
 # Example:
@@ -35,6 +38,7 @@
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 import os,sys                              # system parameters
 import numpy             as np             # numpy
+from ppmodules.writeMesh import *          # to get all writeMesh functions
 # 
 # this is the function that returns True if the elements is oriented CCW
 #def CCW((x1,y1),(x2,y2),(x3,y3)):
@@ -71,8 +75,6 @@ elements_data = np.genfromtxt(elements_file,unpack=True)
 # print nodes_data.shape
 # print elements_data.shape
 
-fout = open(adcirc_file,"w")
-
 # nodes 
 node_id = np.arange(1,len(nodes_data[1,:])+1)
 x = nodes_data[0,:] + xref
@@ -108,18 +110,6 @@ for i in range(len(ikle)):
 		
 		# print('re-orienting element ' + str(i+1))
 
-# now to write the adcirc mesh file
-fout.write("ADCIRC" + "\n")
-# writes the number of elements and number of nodes in the header file
-fout.write(str(len(e1)) + " " + str(len(node_id)) + "\n")
-
-# writes the nodes
-for i in range(0,len(node_id)):
-	fout.write(str(node_id[i]) + " " + str("{:.3f}".format(x[i])) + " " + 
-		str("{:.3f}".format(y[i])) + " " + str("{:.3f}".format(z[i])) + "\n")
-
-# writes the elements
-for i in range(0,len(e1)):
-	fout.write(str(i+1) + " 3 " + str(ikle[i,0]) + " " + str(ikle[i,1]) + " " + 
-		str(ikle[i,2]) + "\n")	
-
+# now to write the adcirc mesh file (the ikle of the renumbered mesh starts
+# at one, writeAdcirc() expects it to start at zero)
+writeAdcirc(len(node_id), len(e1), x, y, z, ikle - 1, adcirc_file)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+#
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#                                                                       #
+#                                 resample_sel.py                       # 
+#                                                                       #
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#
+# Author: Pat Prodanovic, Ph.D., P.Eng.
+# 
+# Date: Oct 17, 2026
+#
+# Purpose: Script takes in a *.slf file, and writes a new *.slf file with
+# a different time step. The results are either linearly interpolated
+# between time steps (mode interp), or aggregated over windows of the new
+# time step (modes mean, max and min; e.g., hourly means or daily maxima).
+# The input file is read once. The script works on at most two time steps
+# (interp) or one time step and one window accumulator (mean, max, min),
+# while the reader thread holds up to two more time steps read ahead, so at
+# most four time steps are in memory at once.
+#
+# The new times start at the first time of the input file. In the interp
+# mode the output has a time step at every multiple of the new time step
+# that is within the input file. In the aggregation modes each window
+# covers the times from its start up to (but excluding) the start of the
+# next window, and is written at the time of its start.
+#
+# Uses: Python 2 or 3, Numpy
+#
+# Example:
+#
+# python resample_sel.py -i in.slf -m mean -t 3600 -o out.slf
+# where:
+# -i input *.slf file
+# -m mode (interp, mean, max or min)
+# -t new time step (in seconds)
+# -o output *.slf file
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Global Imports
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+import os,sys
+import numpy as np
+from ppmodules.selafin_io_pp import *
+# 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# MAIN
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~  
+if len(sys.argv) != 9 :
+  print('Wrong number of Arguments, stopping now...')
+  print('Usage:')
+  print('python resample_sel.py -i in.slf -m mean -t 3600 -o out.slf')
+  sys.exit()
+
+input_file = sys.argv[2]
+mode = sys.argv[4]
+dt = float(sys.argv[6])
+output_file = sys.argv[8]
+
+if (mode not in ['interp', 'mean', 'max', 'min']):
+  print('Mode must be interp, mean, max or min. Exiting!')
+  sys.exit()
+
+if (dt <= 0.0):
+  print('Time step must be positive. Exiting!')
+  sys.exit()
+
+# reads the *.slf file
+slf = ppSELAFIN(input_file)
+slf.readHeader()
+slf.readTimes()
+
+times = slf.getTimes()
+vnames = slf.getVarNames()
+vunits = slf.getVarUnits()
+float_type,float_size = slf.getPrecision()
+NELEM, NPOIN, NDP, IKLE, IPOBO, x, y = slf.getMesh()
+
+if (len(times) < 1):
+  print('There are no time steps in ' + input_file + '. Exiting!')
+  sys.exit()
+
+# write the front matter of the output *.slf file
+out = ppSELAFIN(output_file)
+out.setPrecision(float_type, float_size)
+out.setTitle('created with pputils')
+out.setVarNames(vnames)
+out.setVarUnits(vunits)
+out.setIPARAM([1, 0, 0, 0, 0, 0, 0, 0, 0, 1])
+out.setNPLAN(slf.getNPLAN())
+out.setDATE(slf.getDATE())
+out.setMesh(NELEM, NPOIN, NDP, IKLE, IPOBO, x, y)
+out.writeHeader()
+
+# tolerance used when comparing times
+eps = 1.0E-6 * dt
+
+if (mode == 'interp'):
+  # k is the index of the next output time, times[0] + k*dt
+  k = 0
+  prev_time = None
+  prev_res = None
+
+  for time, res in slf.iterFrames(prefetch=1):
+    t_out = times[0] + k*dt
+    while (t_out <= time + eps):
+      if (prev_res is None or time - prev_time < eps):
+        out.writeVariables(t_out, res)
+      else:
+        w = (t_out - prev_time) / (time - prev_time)
+        out.writeVariables(t_out, (1.0 - w)*prev_res + w*res)
+      k = k + 1
+      t_out = times[0] + k*dt
+    prev_time = time
+    prev_res = res
+else:
+  # k is the index of the current window, and acc its accumulator
+  k = -1
+  acc = None
+  count = 0
+
+  for time, res in slf.iterFrames(prefetch=1):
+    k_frame = int(np.floor((time - times[0] + eps) / dt))
+
+    # the window is complete once a time step beyond it is read
+    if (acc is not None and k_frame != k):
+      if (mode == 'mean'):
+        acc = acc / count
+      out.writeVariables(times[0] + k*dt, acc)
+      acc = None
+
+    if (acc is None):
+      k = k_frame
+      acc = np.array(res, dtype=np.float64)
+      count = 1
+    else:
+      if (mode == 'mean'):
+        acc += res
+      elif (mode == 'max'):
+        np.maximum(acc, res, out=acc)
+      else:
+        np.minimum(acc, res, out=acc)
+      count = count + 1
+
+  if (acc is not None):
+    if (mode == 'mean'):
+      acc = acc / count
+    out.writeVariables(times[0] + k*dt, acc)
+
+out.close()
+slf.close()
+
+print('All done!')
@@ -13,6 +13,9 @@
 # Purpose: Script takes in an ADCIRC mesh and rotates it about a point
 # specified, with the rotation specified.
 #
+# Revised: Oct 17, 2026
+# Rotated mesh is written with writeAdcirc().
+#
 # Uses: Python 2 or 3, Numpy, Scipy
 #
 # Example:
@@ -30,6 +33,7 @@ import os,sys                              # system parameters
 import numpy as np                         # numpy
 from scipy import spatial                  # to get the cKDTree      
 from ppmodules.readMesh import *           # to get all readMesh functions
+from ppmodules.writeMesh import *          # to get all writeMesh functions
 # 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # MAIN
@@ -89,22 +93,7 @@ y_rot = (y-y_coord) * np.cos(angle_rad) + (x-x_coord) * np.sin(angle_rad)
 x_rot = x_rot + x_coord
 y_rot = y_rot + y_coord
 
-# this is the adcirc output mesh (i.e., rotated mesh)
-fout = open(output_file, 'w')
-
-# now to write the adcirc mesh file
-fout.write('ADCIRC' + '\n')
-# writes the number of elements and number of nodes in the header file
-fout.write(str(e) + ' ' + str(n) + '\n')
-
-# writes the nodes
-for i in range(n):
-  fout.write(str(i+1) + ' ' + str('{:.3f}'.format(x_rot[i])) + ' ' +
-    str('{:.3f}'.format(y_rot[i])) + ' ' + str('{:.3f}'.format(z[i])) + '\n')
-
-# writes the elements
-for i in range(e):
-  fout.write(str(i+1) + ' 3 ' + str(ikle[i,0]+1) + ' ' +
-    str(ikle[i,1]+1) + ' ' +  str(ikle[i,2]+1) + '\n')  
+# now to write the adcirc output mesh (i.e., rotated mesh)
+writeAdcirc(n, e, x_rot, y_rot, z, ikle, output_file)
 
 print('All done!')
@@ -20,6 +20,13 @@
 # Rather than scanning data for all time steps, scan the file for a
 # particular time step only.
 #
+# Revised: Oct 17, 2026
+# If the *.slf file has an up to date sidecar *.slfidx index (created with
+# mkslfidx.py), the min and max are taken from it, and no data is read.
+#
+# Revised: Oct 17, 2026
+# The input can also be a compressed archive (*.slfz) written by sel2slfz.py.
+#
 # Uses: Python 2 or 3, Numpy
 #
 # Example: python scan.py -i input.slf -t 3
@@ -51,9 +58,14 @@ else:
   sys.exit()
 
 # constructor for pp_SELAFIN class
-slf = ppSELAFIN(input_file)
+slf = openSELAFIN(input_file)
 slf.readHeader()
-slf.readTimes()
+
+# use the sidecar index (see mkslfidx.py) if there is a valid one; it has
+# the min and max of each variable for every time step already computed
+indexed = slf.readIndex()
+if not indexed:
+  slf.readTimes()
 
 times = slf.getTimes()
 vnames = slf.getVarNames()
@@ -93,12 +105,17 @@ else:
   precision = 'unknown'
 
 # prints variable names and their min and max values from a particular time step
-slf.readVariables(t)
-master_results = slf.getVarValues()
+if indexed:
+  var_stats = slf.getVarStats()
+  minmax[:,0] = var_stats[t,:,0]
+  minmax[:,1] = var_stats[t,:,1]
+else:
+  slf.readVariables(t)
+  master_results = slf.getVarValues()
 
-for j in range(numvars):
-  minmax[j,0] = np.min(master_results[j,:])
-  minmax[j,1] = np.max(master_results[j,:])
+  for j in range(numvars):
+    minmax[j,0] = np.min(master_results[j,:])
+    minmax[j,1] = np.max(master_results[j,:])
   
 print('#########################################################')
 print("The input file being scaned: " + input_file)
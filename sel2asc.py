@@ -13,6 +13,13 @@
 # Modified: Feb 21, 2016
 # Made it work under python 2 or 3
 #
+# Revised: Oct 17, 2026
+# The time step can be given as a model time or as a date and time, in
+# which case the nearest time step in the file is extracted.
+#
+# Revised: Oct 17, 2026
+# The input can also be a compressed archive (*.slfz) written by sel2slfz.py.
+#
 # Purpose: Script designed to open 2D telemac binary file, read the
 # the desired output to an ESRI *.asc file for use in displaying within a
 # GIS environment
@@ -32,6 +39,9 @@
 #
 #       --> -t is the index of the time step to extract; see probl.py for
 #                        index codes of the time steps
+#                        (or the model time in seconds, e.g., 3600s,
+#                        or the date and time, e.g., 2020-06-01T12:30;
+#                        the nearest time step is extracted)
 #
 #       --> -o is the *.asc output file
 #
@@ -42,6 +52,7 @@ import os,sys
 import matplotlib.tri as mtri
 import numpy as np
 from numpy import linspace, dtype          
+from datetime import datetime
 from ppmodules.selafin_io_pp import *
 #
 if len(sys.argv) != 11:
@@ -52,18 +63,28 @@ if len(sys.argv) != 11:
 
 input_file = sys.argv[2]         # input *.slf file
 var_index  = int(sys.argv[4])    # index number of grided output variable 
-t = int(sys.argv[6])             # index of time record of the output to use in griding (integer, 0 to n)                                  
+t_arg = sys.argv[6]              # time record of the output to use in griding (index, time or date)                                  
 spacing = float(sys.argv[8])     # specified the grid spacing of the output file
 output_file = sys.argv[10]       # output *.asc grid file
 
 # Read the header of the selafin result file and get geometry and
 # variable names and units
 
-# use selafin_io_pp class ppSELAFIN
-slf = ppSELAFIN(input_file)
+# use selafin_io_pp class ppSELAFIN (or ppSELAFINz for an archive)
+slf = openSELAFIN(input_file)
 slf.readHeader()
 slf.readTimes()
-slf.readVariables(t)
+
+# the time step is given by its index, its model time (ending in s), or its
+# date and time (relative to the date in the *.slf file)
+if t_arg.endswith('s'):
+	t = slf.getTimeIndex(float(t_arg[:-1]))
+elif ('T' in t_arg):
+	t = slf.getTimeIndex(datetime.strptime(t_arg, '%Y-%m-%dT%H:%M'))
+else:
+	t = int(t_arg)
+
+slf.readVariables(t, [var_index])
 
 # gets some of the mesh properties from the *.slf file
 NELEM, NPOIN, NDP, IKLE, IPOBO, x, y = slf.getMesh()
@@ -72,7 +93,7 @@ NELEM, NPOIN, NDP, IKLE, IPOBO, x, y = slf.getMesh()
 # at zero
 IKLE[:,:] = IKLE[:,:] - 1
 
-# these are the results for all variables, for time step t
+# these are the results for variable var_index, for time step t
 master_results = slf.getVarValues() 
 
 # creates a triangulation grid using matplotlib function Triangulation
@@ -98,7 +119,7 @@ x_regs = xreg[1,:]
 y_regs = yreg[:,1]
 
 # to interpolate to a reg grid
-interpolator = mtri.LinearTriInterpolator(triang, master_results[var_index])
+interpolator = mtri.LinearTriInterpolator(triang, master_results[0])
 z = interpolator(xreg,yreg)
 
 print("Shape of array z: " + str(z.shape[0]))
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+#
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#                                                                       #
+#                                 sel2slfz.py                           # 
+#                                                                       #
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#
+# Author: Pat Prodanovic, Ph.D., P.Eng.
+#
+# Date: Oct 17, 2026
+#
+# Purpose: Converts a selafin file to a compressed archive (*.slfz), for
+# long term storage of results. The frames are grouped in chunks, and each
+# variable of each chunk is compressed on its own (with zlib or lzma), so
+# that reading a few variables or time steps from the archive only
+# decompresses those. Optionally, the values are rounded to a tolerance
+# before compression (lossy), which greatly improves compression. Scripts
+# that open their input with openSELAFIN() (probe.py, scan.py, sel2asc.py,
+# extract_pt.py, ...) read archives directly. Use slfz2sel.py to convert
+# an archive back to a *.slf file.
+#
+# Uses: Python 2 or 3, Numpy
+#
+# Example: python sel2slfz.py -i input.slf -c zlib -e 0.001 -o input.slfz
+# 
+# where:
+#       --> -i is the telemac *.slf file being archived (or a comma
+#                  separated list of *.slf files, restart segments of one run)
+#       --> -c is the compression (zlib, lzma or none)
+#       --> -e is the tolerance of the stored values (0 for lossless)
+#       --> -o is the compressed archive
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Global Imports
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# need future for backward compatibility with python2
+from __future__ import absolute_import, division, print_function
+import os,sys
+from ppmodules.selafin_io_pp import *
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# MAIN
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+#
+if len(sys.argv) != 9:
+  print('Wrong number of Arguments, stopping now...')
+  print('Example usage:')
+  print('python sel2slfz.py -i input.slf -c zlib -e 0.001 -o input.slfz')
+  sys.exit()
+
+input_file = sys.argv[2]          # input *.slf file
+codec = sys.argv[4]               # zlib, lzma or none
+tolerance = float(sys.argv[6])    # tolerance of the stored values
+output_file = sys.argv[8]         # output compressed archive
+
+if (codec not in ('zlib', 'lzma', 'none')):
+  print('Compression has to be zlib, lzma or none. Exiting!')
+  sys.exit()
+
+# constructor for pp_SELAFIN class (or the set reader, for a comma
+# separated list of *.slf files)
+slf = openSELAFIN(input_file)
+slf.readHeader()
+slf.readTimes()
+
+print('Archiving ' + input_file + ' to ' + output_file + ' ...')
+slf.writeArchive(output_file, codec, tolerance)
+slf.close()
+
+input_size = sum([os.path.getsize(f) for f in slf.slf_files]) if isinstance(slf, ppSELAFINset) \
+  else os.path.getsize(input_file)
+print('Size of the *.slf file: ' + str(input_size) + ' bytes')
+print('Size of the archive: ' + str(os.path.getsize(output_file)) + ' bytes')
+
+print('All done!')
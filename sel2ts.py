@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+#
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#                                                                       #
+#                                 sel2ts.py                             # 
+#                                                                       #
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#
+# Author: Pat Prodanovic, Ph.D., P.Eng.
+#
+# Date: Oct 17, 2026
+#
+# Purpose: Converts a selafin file to a node major (time series optimized)
+# companion file. A *.slf file stores all nodes for one time step together,
+# so extracting the time series at a node needs a seek for every variable
+# of every time step. The companion file stores the time steps in chunks,
+# and within each chunk all times and variables of a node are contiguous.
+# The *.slf file is read only once. The companion file can be given to
+# extract_bord.py instead of the *.slf file.
+#
+# Revised: Oct 17, 2026
+# The input can also be a comma separated list of *.slf files on the same
+# mesh (restart segments of one run), or a compressed archive (*.slfz).
+#
+# Uses: Python 2 or 3, Numpy
+#
+# Example: python sel2ts.py -i input.slf -o input.slfts
+# 
+# where:
+#       --> -i is the telemac *.slf file being converted (or a comma
+#                  separated list of *.slf files, or a *.slfz archive)
+#       --> -o is the node major companion file
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Global Imports
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# need future for backward compatibility with python2
+from __future__ import absolute_import, division, print_function
+import sys
+import numpy as np             
+from ppmodules.selafin_io_pp import *
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# MAIN
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+#
+if len(sys.argv) != 5:
+  print('Wrong number of Arguments, stopping now...')
+  print('Example usage:')
+  print('python sel2ts.py -i input.slf -o input.slfts')
+  sys.exit()
+
+input_file = sys.argv[2]   # input *.slf file
+output_file = sys.argv[4]  # output node major file
+
+# constructor for pp_SELAFIN class (or the set or archive reader)
+slf = openSELAFIN(input_file)
+slf.readHeader()
+slf.readTimes()
+
+print('Converting ' + input_file + ' to ' + output_file + ' ...')
+slf.writeNodeMajor(output_file)
+slf.close()
+
+print('All done!')
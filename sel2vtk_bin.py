@@ -14,6 +14,9 @@
 # files. It writes a double precision Paraview binary file regardless
 # of the precision of the input *.slf file.
 #
+# Revised: Oct 17, 2026
+# The input can also be a compressed archive (*.slfz) written by sel2slfz.py.
+#
 # Using: Python 2 or 3, Matplotlib, Numpy
 #
 # Example: python sel2vtk_bin.py -i results.slf -o results.vtk
@@ -45,8 +48,8 @@ else:
   sys.exit()
   
 # we are going to have one file per time record in the slf file
-# use selafin_io_pp class ppSELAFIN
-slf = ppSELAFIN(input_file)
+# use selafin_io_pp class ppSELAFIN (or ppSELAFINz for an archive)
+slf = openSELAFIN(input_file)
 slf.readHeader()
 slf.readTimes()
 
@@ -112,17 +115,19 @@ elif (idx_list[-1] not in idx_times):
   print('Ending time specified not in *.slf file. Exiting.')
   sys.exit()
 
+# the time steps are streamed from the *.slf file, with the next ones
+# read in the background while the current file is written
+frames = slf.iterFrames(t_start, t_end)
+
 # to create the multiple output files
 for count, item in enumerate(filenames):
   print('Writting file: ' + item)
   file_out.append(item)
   file_out[count] = open(item,'wb')
   
-  # item is the actual file name, which corresponds to each time step
-  slf.readVariables(idx_list[count])
-  
+  # item is the actual file name, which corresponds to each time step;
   # these are the results for all variables, for time step count
-  master_results = slf.getVarValues() 
+  time_t, master_results = next(frames)
 
   file_out[count].write(pack('>26s', '# vtk DataFile Version 2.0'.encode()))
   file_out[count].write(pack('>c', b'\n'))
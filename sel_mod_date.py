@@ -16,6 +16,10 @@
 # Revised: Nov 2, 2020
 # Times were incorrectly written in the result file. This is now fixed.
 #
+# Revised: Oct 17, 2026
+# Frames are copied to the output file as raw bytes, so only the header
+# is re-written.
+#
 # Uses: Python 2 or 3, Numpy
 #
 # Example:
@@ -32,7 +36,6 @@
 import os,sys
 import numpy as np
 from ppmodules.selafin_io_pp import *
-from progressbar import ProgressBar, Bar, Percentage, ETA
 # 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # MAIN
@@ -92,22 +95,12 @@ slf_out.setTitle('created with pputils')
 slf_out.setVarNames(vnames)
 slf_out.setVarUnits(vunits)
 slf_out.setIPARAM([1, 0, 0, 0, 0, 0, 0, 0, 0, 1])
+slf_out.setNPLAN(slf.getNPLAN())
 slf_out.setMesh(NELEM, NPOIN, NDP, IKLE, IPOBO, x, y)
 slf_out.setDATE([year,month,day,hour,minute,second])
 slf_out.writeHeader()
 
-# for the progress bar
-w = [Percentage(), Bar(), ETA()]
-pbar = ProgressBar(widgets=w, maxval=len(times)).start()
-
-# now loop over each time step, read the all the variables, and write
-# them to the file
-for t in range(len(times)):
-  pbar.update(t+1)
-  # read the variables for each time step
-  slf.readVariables(t)
-  results = slf.getVarValues()
-
-  # write the answers to the output file
-  slf_out.writeVariables(times[t], results)
-pbar.finish()
+# now copy all time steps to the output file; only the header is
+# different, so the frames are copied as raw bytes
+slf_out.copyFrames(slf)
+slf_out.close()
@@ -14,6 +14,9 @@
 # coordinates, while keeping all results as they are. This script just
 # shifts the x and y coordinates of the *.slf file, and nothing else!
 #
+# Revised: Oct 17, 2026
+# Frames are copied to the output file as raw bytes.
+#
 # Uses: Python 2 or 3, Matplotlib, Numpy
 #
 # Example:
@@ -77,17 +80,12 @@ outslf.setTitle('created with pputils')
 outslf.setVarNames(variables)
 outslf.setVarUnits(units)
 outslf.setIPARAM([1, 0, 0, 0, 0, 0, 0, 0, 0, 1])
+outslf.setNPLAN(slf.getNPLAN())
 outslf.setMesh(NELEM, NPOIN, NDP, IKLE, IPOBO, x_s, y_s)
 outslf.writeHeader()
 
-# read all data, for all time steps, and simply put it in outslf object
-for t in range(len(times)):
-  
-  # read the data from the original *.slf file
-  slf.readVariables(t)
-  res = slf.getVarValues()
-  
-  # write the data to the transformed *.slf file
-  outslf.writeVariables(times[t], res)
+# copy all data, for all time steps, to the outslf object; only the
+# header is different, so the frames are copied as raw bytes
+outslf.copyFrames(slf)
 
 print('All done!')
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+#
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#                                                                       #
+#                                 slfz2sel.py                           # 
+#                                                                       #
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#
+# Author: Pat Prodanovic, Ph.D., P.Eng.
+#
+# Date: Oct 17, 2026
+#
+# Purpose: Converts a compressed archive (*.slfz, written by sel2slfz.py)
+# back to a selafin file. The header and the record markers are those of
+# the original file, so an archive written with a tolerance of 0 restores
+# the original file byte for byte. If the archive was written with a
+# tolerance, the values are those rounded to the tolerance.
+#
+# Uses: Python 2 or 3, Numpy
+#
+# Example: python slfz2sel.py -i input.slfz -o output.slf
+# 
+# where:
+#       --> -i is the compressed archive
+#       --> -o is the telemac *.slf file
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Global Imports
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# need future for backward compatibility with python2
+from __future__ import absolute_import, division, print_function
+import sys
+from ppmodules.selafin_io_pp import *
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# MAIN
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+#
+if len(sys.argv) != 5:
+  print('Wrong number of Arguments, stopping now...')
+  print('Example usage:')
+  print('python slfz2sel.py -i input.slfz -o output.slf')
+  sys.exit()
+
+input_file = sys.argv[2]   # input compressed archive
+output_file = sys.argv[4]  # output *.slf file
+
+# reads the archive
+slf = ppSELAFINz(input_file)
+slf.readHeader()
+slf.readTimes()
+
+print('Restoring ' + input_file + ' to ' + output_file + ' ...')
+
+# the header of the original *.slf file is written as it was stored in the
+# archive, and the frames are decompressed and written one at a time
+slf.writeSELAFIN(output_file)
+slf.close()
+
+print('All done!')
@@ -177,16 +177,14 @@ pbar = ProgressBar(widgets=w, maxval=len(times)).start()
 
 # to perform triangulation for each variable in the result file, 
 # for each time step
-for t in range(len(times)):
+# (results are streamed from the *.slf file, with the next time steps
+# read in the background while the current one is interpolated)
+for t, (time_t, results) in enumerate(res.iterFrames()):
   pbar.update(t+1)
   # print('Writing time step: ' + str(t))
   # this is the master transposed array, for time step t
   mesh_results = np.zeros((numvars, NPOIN_m))
   
-  # reads the results for a particular variable, and stores it into results
-  res.readVariables(t)
-  results = res.getVarValues()
-  
   # perform the interpolation and create mesh_results array
   for i in range(numvars):
     
@@ -229,5 +227,5 @@ for t in range(len(times)):
           d, idx = tree.query((x_m[j],y_m[j]), k = 1)
           mesh_results[i,j] = results[i][idx]
 
-  mres.writeVariables(times[t], mesh_results)
+  mres.writeVariables(time_t, mesh_results)
 pbar.finish()
@@ -11,6 +11,7 @@
 # Date: June 26, 2016 / July 22, 2022
 
 import numpy as np
+from ppmodules.writeMesh import *
 
 
 def CCW(x1, y1, x2, y2, x3, y3):
@@ -28,9 +29,6 @@ def triangle2adcirc(nodes_file="out.1.node", elements_file="out.1.ele", output_f
   :param str output_file: output adcirc mesh file
   :return:
   """
-    # to create the output file
-    fout = open(output_file, "w")
-
     # use numpy to read the file
     # each column in the file is a row in data read by no.loadtxt method
     nodes_data = np.genfromtxt(nodes_file, skip_header=1, comments="#", unpack=True)
@@ -73,17 +71,6 @@ def triangle2adcirc(nodes_file="out.1.node", elements_file="out.1.ele", output_f
             ikle[i, 2] = t0
     # #######################
 
-    # now to write the adcirc mesh file
-    fout.write("ADCIRC" + "\n")
-    # writes the number of elements and number of nodes in the header file
-    fout.write(str(len(element_id)) + " " + str(len(node_id)) + "\n")
-
-    # writes the nodes
-    for i in range(0, len(node_id)):
-        fout.write(str(node_id[i]) + " " + str("{:.3f}".format(x[i])) + " " +
-                   str("{:.3f}".format(y[i])) + " " + str("{:.3f}".format(z[i])) + "\n")
-
-    # writes the elements
-    for i in range(0, len(element_id)):
-        fout.write(str(element_id[i]) + " 3 " + str(ikle[i, 0]) + " " + str(ikle[i, 1]) + " " +
-                   str(ikle[i, 2]) + "\n")
+    # now to write the adcirc mesh file (the nodes from triangle are numbered from one, writeAdcirc() expects the ikle
+    # to start at zero)
+    writeAdcirc(len(node_id), len(element_id), x, y, z, ikle - 1, output_file)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+#
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#                                                                       #
+#                                 validate_sel.py                       #
+#                                                                       #
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#
+# Author: Pat Prodanovic, Ph.D., P.Eng.
+#
+# Date: Oct 17, 2026
+#
+# Purpose: Checks that every frame of a selafin file is complete, and
+# reports the last complete frame. Simulations that crash (or are still
+# running) leave a partial frame at the end of the *.slf file. Only the
+# record markers of each frame are checked (no data is read), so even very
+# large files are validated in seconds. Optionally, the valid part of the
+# file (header and complete frames) is copied to a new file, or the file
+# is truncated in place after the last complete frame.
+#
+# Uses: Python 2 or 3, Numpy
+#
+# Example: python validate_sel.py -i input.slf
+#          python validate_sel.py -i input.slf -o valid.slf
+#          python validate_sel.py -i input.slf -t
+#
+# where:
+#       --> -i is the telemac *.slf file being validated
+#       --> -o (optional) is the *.slf file to which the valid part of the
+#                         input file is copied
+#       --> -t (optional) truncates the input file after its last complete
+#                         frame
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Global Imports
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# need future for backward compatibility with python2
+from __future__ import absolute_import, division, print_function
+import sys
+from ppmodules.selafin_io_pp import *
+
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# MAIN
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+#
+output_file = None
+truncate = False
+
+if len(sys.argv) == 3:
+  input_file = sys.argv[2]
+elif (len(sys.argv) == 5 and sys.argv[3] == '-o'):
+  input_file = sys.argv[2]
+  output_file = sys.argv[4]
+elif (len(sys.argv) == 4 and sys.argv[3] == '-t'):
+  input_file = sys.argv[2]
+  truncate = True
+else:
+  print('Wrong number of Arguments, stopping now...')
+  print('Example usage:')
+  print('python validate_sel.py -i input.slf')
+  print('python validate_sel.py -i input.slf -o valid.slf')
+  print('python validate_sel.py -i input.slf -t')
+  sys.exit()
+
+# constructor for pp_SELAFIN class
+slf = ppSELAFIN(input_file)
+slf.readHeader()
+
+numFrames, valid_size, file_size = slf.validateFrames()
+
+print('#########################################################')
+print('The input file being validated: ' + input_file)
+print('Number of complete time steps: ' + str(numFrames))
+if (numFrames > 0):
+  slf.readTimes()
+  print('Last complete time step: ' + str(numFrames - 1) + ' (time ' +
+    str(slf.getTimes()[numFrames - 1]) + ')')
+print('Size of the file: ' + str(file_size) + ' bytes')
+print('Size of the valid part: ' + str(valid_size) + ' bytes')
+if (valid_size == file_size):
+  print('The file is complete.')
+else:
+  print('The file has ' + str(file_size - valid_size) +
+    ' bytes of incomplete or corrupt data after the last complete time step.')
+print('#########################################################')
+
+if (output_file is not None):
+  slf.repairFile(output_file)
+  print('Valid part of the file written to ' + output_file)
+elif (truncate and valid_size < file_size):
+  slf.repairFile()
+  print('File truncated after the last complete time step.')
+
+slf.close()
+
+print('All done!')